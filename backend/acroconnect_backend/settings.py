@@ -20,6 +20,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 import os
 from dotenv import load_dotenv
 
+from .database import parse_database_url
+
 env_file = BASE_DIR / '.env.local'
 if env_file.exists():
     load_dotenv(env_file)
@@ -52,6 +54,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.TracingMiddleware',
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -60,6 +64,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'acroconnect_backend.urls'
@@ -85,13 +90,53 @@ WSGI_APPLICATION = 'acroconnect_backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DATABASE_URL selects the database (see acroconnect_backend/database.py);
+# without it the local SQLite file is used. Postgres connections come from a
+# per-process pool sized to the gunicorn thread count (DB_POOL=0 switches to
+# persistent per-thread connections kept for DB_CONN_MAX_AGE seconds).
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': parse_database_url(
+        os.getenv('DATABASE_URL', 'sqlite:///db.sqlite3'),
+        base_dir=BASE_DIR,
+        conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', '600')),
+        pool_size=int(os.getenv('GUNICORN_THREADS', '4')) if os.getenv('DB_POOL', '1') == '1' else None,
+    ),
 }
 
+# DATABASE_REPLICA_URL adds a read replica: ORM reads of GET requests go to it
+# (see core/db_routers.py) while users who just wrote keep reading from the
+# primary for REPLICA_PIN_SECONDS. For a local SQLite setup, point it at a
+# second file and run `python manage.py sync_replica --interval 5`.
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+if os.getenv('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = {
+        **parse_database_url(
+            os.getenv('DATABASE_REPLICA_URL'),
+            base_dir=BASE_DIR,
+            conn_max_age=DATABASES['default'].get('CONN_MAX_AGE', 0),
+            pool_size=DATABASES['default']['OPTIONS'].get('pool', {}).get('max_size'),
+        ),
+        # Tests run against a single database.
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['core.db_routers.ReplicaRouter']
+    MIDDLEWARE.insert(2, 'core.middleware.ReplicaRoutingMiddleware')
+
+# SQLITE_TUNED=1 opts single-node SQLite installs into WAL journaling and the
+# pragmas below (applied to every new connection by core/db.py), and makes
+# transactions take the write lock up front so concurrent workers wait for it
+# (busy_timeout) instead of failing with "database is locked".
+SQLITE_TUNED = os.getenv('SQLITE_TUNED') == '1'
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 5000,
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # KiB
+} if SQLITE_TUNED else {}
+if SQLITE_TUNED and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['OPTIONS']['transaction_mode'] = 'IMMEDIATE'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -136,10 +181,26 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.CustomUser'
 
+# Username-or-email login with a single lookup and a single password hash.
+AUTHENTICATION_BACKENDS = ['core.backends.UsernameOrEmailBackend']
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'core.authentication.ClaimsJWTAuthentication',
+    ),
+    # JSON stays the default representation; clients can ask for MessagePack
+    # with "Accept: application/msgpack" (or ?format=msgpack).
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'core.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.renderers.FastJSONParser',
+        'core.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -147,6 +208,53 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
 }
 
+# How long a user's token version is cached. With a per-process cache this is
+# also the upper bound for a role change to revoke tokens on other workers.
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+
+# Cache
+# Token versions and the per-user /me payloads live in the default cache and
+# are invalidated by model signals. Every gunicorn worker has to share the
+# cache for those invalidations to reach it, so run production with
+# CACHE_BACKEND=file (single host) or CACHE_BACKEND=redis (needs the `redis`
+# package); the in-process default only suits runserver or a single worker.
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_DIR', '/tmp/acroconnect-cache'),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/0'),
+    },
+}
+CACHES = {
+    'default': CACHE_BACKENDS[CACHE_BACKEND],
+    # Rendered response bodies (core.response_cache); kept apart from the
+    # default cache so large entries cannot evict token versions.
+    'responses': {
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        'KEY_PREFIX': 'responses',
+        **({'LOCATION': os.getenv('RESPONSE_CACHE_DIR', '/tmp/acroconnect-response-cache')}
+           if CACHE_BACKEND == 'file' else {}),
+    },
+}
+
+# Seconds a serialized /me payload may be served from the cache.
+ME_CACHE_TIMEOUT = 300
+
+# Seconds a rendered skill/job posting response may be served from the cache;
+# writes retire affected entries immediately through model signals.
+RESPONSE_CACHE_TIMEOUT = 600
+# Bodies smaller than this are not worth storing compressed variants for.
+RESPONSE_CACHE_MIN_COMPRESS_SIZE = 512
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8501",
     "http://localhost:3000",
@@ -155,3 +263,29 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+
+
+# Request metrics (served in Prometheus format at /metrics/).
+# Point METRICS_MULTIPROC_DIR at a directory shared by all gunicorn workers so
+# a scrape aggregates every process; leave it unset for a single process.
+# METRICS_ALLOWED_IPS lists the addresses or CIDR networks that may scrape,
+# e.g. the docker-compose network for a Prometheus container.
+METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR') or None
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '1.0'))
+METRICS_ALLOWED_IPS = os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+
+# Staff requests with ``X-Profile: 1`` or ``?profile=1`` are profiled into
+# PROFILE_DIR (see core/profiling.py), which keeps the newest PROFILE_KEEP.
+PROFILE_DIR = os.getenv('PROFILE_DIR', '/tmp/acroconnect-profiles')
+PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', '100'))
+
+# Request tracing (core/tracing.py). TRACING_EXPORTER is "" (off), "jsonl"
+# (spans appended to TRACING_FILE) or "otlp" (OTLP/HTTP JSON to a local
+# collector at TRACING_OTLP_ENDPOINT); TRACING_SAMPLE_RATE of requests are
+# traced unless an incoming traceparent header decides.
+TRACING_EXPORTER = os.getenv('TRACING_EXPORTER', '')
+TRACING_SAMPLE_RATE = float(os.getenv('TRACING_SAMPLE_RATE', '0.01'))
+TRACING_MAX_SPANS = int(os.getenv('TRACING_MAX_SPANS', '1000'))
+TRACING_FILE = os.getenv('TRACING_FILE', '/tmp/acroconnect-traces.jsonl')
+TRACING_OTLP_ENDPOINT = os.getenv('TRACING_OTLP_ENDPOINT', 'http://127.0.0.1:4318/v1/traces')
+TRACING_SERVICE_NAME = os.getenv('TRACING_SERVICE_NAME', 'acroconnect-backend')
@@ -18,11 +18,17 @@ from django.contrib import admin
 from django.urls import include, path
 from rest_framework_simplejwt.views import TokenRefreshView
 
-from core.views import CustomTokenObtainPairView
+from core.admin import profile_detail, profile_download, profile_list
+from core.views import CustomTokenObtainPairView, MetricsView
 
 urlpatterns = [
+    path('admin/profiles/', admin.site.admin_view(profile_list), name='admin-profiles'),
+    path('admin/profiles/<str:name>/', admin.site.admin_view(profile_detail), name='admin-profile-detail'),
+    path('admin/profiles/<str:name>/download/', admin.site.admin_view(profile_download), name='admin-profile-download'),
     path('admin/', admin.site.urls),
     path('api/token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/v1/', include('core.urls')),
+    path('api/v1/async/', include('core.async_urls')),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
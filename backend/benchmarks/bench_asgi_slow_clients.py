@@ -0,0 +1,200 @@
+"""
+WSGI vs ASGI under a slow-client workload.
+
+Starts each server on a freshly migrated and seeded SQLite file, then runs
+``--slow`` clients that trickle their request headers over ``--slow-seconds``
+(mobile clients on a bad network) next to ``--fast`` clients hammering the
+skill list for the same period. Reported per server: fast-client throughput
+and latency, how many slow requests completed, and peak server RSS.
+
+    wsgi  gunicorn, 1 gthread worker with --threads threads, /api/v1/skills/
+    asgi  uvicorn, 1 worker, /api/v1/async/skills/
+
+A gthread worker hands each connection to a thread that then blocks until
+the whole request has arrived, so slow clients use up the thread pool; the
+ASGI server parses requests on its event loop.
+
+Usage (from ``backend/``):
+
+    python benchmarks/bench_asgi_slow_clients.py --slow 32 --fast 4 --threads 8
+"""
+
+import argparse
+import http.client
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import BACKEND_DIR
+
+PORT = 8765
+SERVERS = {
+    "wsgi": (
+        "gunicorn",
+        lambda args: ["gunicorn", "acroconnect_backend.wsgi:application", "--bind", f"127.0.0.1:{PORT}",
+                      "--workers", "1", "--threads", str(args.threads), "--timeout", "120"],
+        "/api/v1/skills/",
+    ),
+    "asgi": (
+        "uvicorn",
+        lambda args: ["uvicorn", "acroconnect_backend.asgi:application", "--port", str(PORT),
+                      "--workers", "1", "--log-level", "warning"],
+        "/api/v1/async/skills/",
+    ),
+}
+
+
+def seed():
+    from core.models import CustomUser, Skill
+    from core.serializers import CustomTokenObtainPairSerializer
+
+    Skill.objects.bulk_create(Skill(skill_name=f"Skill {i}", category="Programming") for i in range(50))
+    user = CustomUser.objects.create_user("student", "student@example.com", "pass12345")
+    print(CustomTokenObtainPairSerializer.get_token(user).access_token)
+
+
+def rss_kib(pid):
+    """Resident memory of ``pid`` and all of its descendants."""
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            status = Path(f"/proc/{current}/status").read_text()
+            total += int(next(line.split()[1] for line in status.splitlines() if line.startswith("VmRSS")))
+            for task in Path(f"/proc/{current}/task").iterdir():
+                pending += [int(child) for child in (task / "children").read_text().split()]
+        except (OSError, StopIteration):
+            continue
+    return total
+
+
+def wait_for_server(timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", PORT), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def slow_client(path, token, seconds, results):
+    headers = ["Host: 127.0.0.1", f"Authorization: Bearer {token}", "Accept: application/json"]
+    headers += [f"X-Padding-{i}: {'x' * 32}" for i in range(8)]
+    try:
+        with socket.create_connection(("127.0.0.1", PORT), timeout=seconds + 60) as sock:
+            sock.sendall(f"GET {path} HTTP/1.1\r\n".encode())
+            for header in headers:
+                time.sleep(seconds / len(headers))
+                sock.sendall(f"{header}\r\n".encode())
+            sock.sendall(b"Connection: close\r\n\r\n")
+            status = sock.recv(64).split(b" ", 2)[1]
+            results.append(status == b"200")
+    except OSError:
+        results.append(False)
+
+
+def fast_client(path, token, stop, latencies, errors):
+    connection = http.client.HTTPConnection("127.0.0.1", PORT, timeout=60)
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path, headers={"Authorization": f"Bearer {token}"})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append("io")
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", PORT, timeout=60)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def run_server(name, args, env, token):
+    _, command, path = SERVERS[name]
+    server = subprocess.Popen(command(args), cwd=BACKEND_DIR, env=env)
+    try:
+        wait_for_server()
+        slow_results, latencies, errors = [], [], []
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=slow_client, args=(path, token, args.slow_seconds, slow_results))
+            for _ in range(args.slow)
+        ] + [
+            threading.Thread(target=fast_client, args=(path, token, stop, latencies, errors))
+            for _ in range(args.fast)
+        ]
+        for thread in threads:
+            thread.start()
+        peak_rss, deadline = 0, time.monotonic() + args.slow_seconds
+        while time.monotonic() < deadline:
+            peak_rss = max(peak_rss, rss_kib(server.pid))
+            time.sleep(0.2)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else float("nan")  # noqa: E731
+    return {
+        "rps": len(latencies) / args.slow_seconds,
+        "p50": pct(0.50),
+        "p99": pct(0.99),
+        "errors": len(errors),
+        "slow_ok": sum(slow_results),
+        "rss_mib": peak_rss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slow", type=int, default=32, help="slow clients")
+    parser.add_argument("--slow-seconds", type=float, default=10.0, help="time each slow client takes to send its request")
+    parser.add_argument("--fast", type=int, default=4, help="fast clients")
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads")
+    parser.add_argument("--servers", nargs="+", choices=SERVERS, default=list(SERVERS))
+    parser.add_argument("--seed", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed:
+        from common import setup_django
+
+        setup_django()
+        seed()
+        return
+
+    print(f"{'server':<6} {'fast req/s':>10} {'p50 ms':>8} {'p99 ms':>9} {'errors':>7} {'slow ok':>8} {'peak RSS MiB':>13}")
+    for name in args.servers:
+        if shutil.which(SERVERS[name][0]) is None:
+            print(f"{name:<6} skipped: {SERVERS[name][0]} is not installed")
+            continue
+        with tempfile.TemporaryDirectory() as directory:
+            env = {**os.environ, "DATABASE_URL": f"sqlite:///{directory}/db.sqlite3", "CACHE_BACKEND": "locmem"}
+            subprocess.run(
+                [sys.executable, "manage.py", "migrate", "--noinput", "-v", "0"],
+                cwd=BACKEND_DIR, env=env, check=True,
+            )
+            token = subprocess.run(
+                [sys.executable, __file__, "--seed"], env=env, check=True, capture_output=True, text=True,
+            ).stdout.strip().splitlines()[-1]
+            result = run_server(name, args, env, token)
+        print(
+            f"{name:<6} {result['rps']:>10.1f} {result['p50']:>8.1f} {result['p99']:>9.1f} "
+            f"{result['errors']:>7} {result['slow_ok']:>4}/{args.slow:<3} {result['rss_mib']:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
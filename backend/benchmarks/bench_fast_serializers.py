@@ -0,0 +1,73 @@
+"""
+ModelSerializer vs values()-based list building (``core/fast_serializers.py``).
+
+Seeds a throwaway database with ``seed_benchmark_data`` and times building
+and rendering the student profile and job posting lists both ways, from the
+viewsets' querysets. Each timing is the best of ``--repeat`` runs and
+includes the queries.
+
+Usage (from ``backend/``):
+
+    python benchmarks/bench_fast_serializers.py --students 5000 --jobs 2000
+"""
+
+import argparse
+import time
+
+from common import setup_django, test_database
+
+setup_django()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from core import fast_serializers  # noqa: E402
+from core.renderers import FastJSONRenderer  # noqa: E402
+from core.serializers import JobPostingSerializer, StudentProfileSerializer  # noqa: E402
+from core.views import JobPostingViewSet, StudentProfileViewSet  # noqa: E402
+
+LISTS = [
+    ("student-profiles", StudentProfileViewSet, StudentProfileSerializer, fast_serializers.student_profiles),
+    ("job-postings", JobPostingViewSet, JobPostingSerializer, fast_serializers.job_postings),
+]
+
+
+def measure(build, repeat):
+    renderer = FastJSONRenderer()
+    best = float("inf")
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            body = renderer.render(build())
+            best = min(best, time.perf_counter() - start)
+    return best, len(ctx.captured_queries), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with test_database():
+        call_command(
+            "seed_benchmark_data", students=args.students, tpos=20, jobs=args.jobs,
+            roadmaps_per_student=0, verbosity=0,
+        )
+        print(f"{'list':<17} {'path':<11} {'rows':>6} {'ms':>9} {'queries':>8} {'speedup':>8}")
+        for name, viewset, serializer_class, builder in LISTS:
+            queryset = viewset.queryset
+            slow, slow_queries, slow_body = measure(
+                lambda: serializer_class(queryset.all(), many=True).data, args.repeat
+            )
+            fast, fast_queries, fast_body = measure(lambda: builder(queryset.all()), args.repeat)
+            assert fast_body == slow_body, f"{name}: fast path output differs"
+            rows = queryset.count()
+            print(f"{name:<17} {'serializer':<11} {rows:>6} {slow * 1000:>9.1f} {slow_queries:>8}")
+            print(f"{name:<17} {'values()':<11} {rows:>6} {fast * 1000:>9.1f} {fast_queries:>8} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
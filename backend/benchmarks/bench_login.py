@@ -0,0 +1,95 @@
+"""
+Login throughput benchmark: legacy token flow vs UsernameOrEmailBackend.
+
+The legacy flow is the previous ``CustomTokenObtainPairSerializer.validate``:
+look the user up by username, then by email, ``check_password`` and finally
+``authenticate()`` again inside ``super().validate`` - two lookups and two
+PBKDF2 hashes per login. The new flow authenticates once.
+
+Usage (from ``backend/``):
+
+    python benchmarks/bench_login.py --users 200 --logins 40
+"""
+
+import argparse
+import random
+import time
+
+from common import setup_django, test_database
+
+setup_django()
+
+from django.contrib.auth.backends import ModelBackend  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from core.models import CustomUser  # noqa: E402
+from core.serializers import CustomTokenObtainPairSerializer  # noqa: E402
+
+PASSWORD = "correct-horse-battery"
+
+
+def legacy_login(identifier, password):
+    try:
+        user = CustomUser.objects.get(username=identifier)
+    except CustomUser.DoesNotExist:
+        user = CustomUser.objects.get(email=identifier)
+    if not user.is_active or not user.check_password(password):
+        raise ValueError("invalid credentials")
+    # TokenObtainPairSerializer.validate -> authenticate() with ModelBackend
+    user = ModelBackend().authenticate(None, username=user.username, password=password)
+    refresh = RefreshToken.for_user(user)
+    return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+
+def new_login(identifier, password):
+    serializer = CustomTokenObtainPairSerializer(data={"username": identifier, "password": password})
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def run(login, identifiers, password):
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        for identifier in identifiers:
+            login(identifier, password)
+        elapsed = time.perf_counter() - start
+    return elapsed, len(ctx.captured_queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with test_database():
+        hashed = make_password(PASSWORD)
+        CustomUser.objects.bulk_create(
+            CustomUser(username=f"student{i}", email=f"student{i}@acropolis.in", password=hashed)
+            for i in range(args.users)
+        )
+        rng = random.Random(args.seed)
+        # Half the logins use the username, half the email address.
+        identifiers = [
+            f"student{i}" if n % 2 else f"student{i}@acropolis.in"
+            for n, i in enumerate(rng.randrange(args.users) for _ in range(args.logins))
+        ]
+
+        print(f"{'flow':<8} {'logins/s':>9} {'ms/login':>9} {'queries/login':>14}")
+        results = {}
+        for name, login in [("legacy", legacy_login), ("backend", new_login)]:
+            elapsed, queries = run(login, identifiers, PASSWORD)
+            results[name] = elapsed
+            print(
+                f"{name:<8} {args.logins / elapsed:>9.1f} {elapsed / args.logins * 1000:>9.1f} "
+                f"{queries / args.logins:>14.1f}"
+            )
+        print(f"speedup: {results['legacy'] / results['backend']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Microbenchmark for the API renderers.
+
+Renders realistic ``StudentProfileSerializer`` payloads with DRF's stock
+``JSONRenderer``, ``FastJSONRenderer`` and ``MessagePackRenderer`` and reports
+render time and payload size (raw and gzipped).
+
+Usage (from ``backend/``):
+
+    python benchmarks/bench_renderers.py --sizes 100 1000 5000 --repeat 20
+"""
+
+import argparse
+import gzip
+import random
+import time
+
+from common import setup_django
+
+setup_django()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.utils.serializer_helpers import ReturnList  # noqa: E402
+
+from core.renderers import FastJSONRenderer, MessagePackRenderer  # noqa: E402
+
+SKILLS = [
+    ("Python", "Programming"), ("Java", "Programming"), ("C++", "Programming"),
+    ("SQL", "Databases"), ("Django", "Web"), ("React", "Web"),
+    ("Machine Learning", "Data Science"), ("Pandas", "Data Science"),
+    ("Docker", "DevOps"), ("Git", "Tools"), ("Communication", "Soft Skills"),
+    ("Data Structures", "Computer Science"),
+]
+
+
+def make_profile(rng, pk):
+    """Build one profile shaped exactly like StudentProfileSerializer output."""
+    first = rng.choice(["Aarav", "Diya", "Ishaan", "Kavya", "Rohan", "Sneha", "Vihaan", "Ananya"])
+    last = rng.choice(["Sharma", "Patel", "Verma", "Gupta", "Iyer", "Khan", "Joshi", "Nair"])
+    username = f"{first.lower()}{pk}"
+    skills = rng.sample(range(len(SKILLS)), rng.randint(2, 8))
+    return {
+        "id": pk,
+        "user": {
+            "id": pk,
+            "username": username,
+            "email": f"{username}@acropolis.in",
+            "first_name": first,
+            "last_name": last,
+            "is_tpo": False,
+            "is_active": True,
+        },
+        "full_name": f"{first} {last}",
+        "phone": f"98{rng.randint(10000000, 99999999)}",
+        "cgpa": round(rng.uniform(5.0, 10.0), 2),
+        "resume_url": f"https://drive.example.com/resumes/{username}.pdf",
+        "career_goal": "Become a backend engineer working on large scale distributed systems.",
+        "skill_assignments": [
+            {
+                "id": pk * 16 + index,
+                "student_profile": pk,
+                "skill": {"id": skill_id + 1, "skill_name": SKILLS[skill_id][0], "category": SKILLS[skill_id][1]},
+                "skill_level": rng.randint(1, 5),
+            }
+            for index, skill_id in enumerate(skills)
+        ],
+    }
+
+
+def bench(renderer, data, repeat):
+    best = float("inf")
+    payload = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = renderer.render(data, renderer.media_type, {})
+        best = min(best, time.perf_counter() - start)
+    return best, payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    renderers = [
+        ("drf-json", JSONRenderer()),
+        ("fast-json", FastJSONRenderer()),
+        ("msgpack", MessagePackRenderer()),
+    ]
+
+    print(f"{'profiles':>8}  {'renderer':<10} {'best ms':>9} {'speedup':>8} {'bytes':>10} {'gzip':>9}")
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        data = ReturnList([make_profile(rng, pk) for pk in range(1, size + 1)], serializer=None)
+        baseline = None
+        for name, renderer in renderers:
+            elapsed, payload = bench(renderer, data, args.repeat)
+            baseline = baseline or elapsed
+            print(
+                f"{size:>8}  {name:<10} {elapsed * 1000:>9.2f} {baseline / elapsed:>7.1f}x "
+                f"{len(payload):>10} {len(gzip.compress(payload)):>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Signup burst benchmark: legacy registration vs ``services.register_user``.
+
+The legacy flow is the previous ``CustomUserSerializer.create``: insert the
+user, ``set_password`` and save it again, let the post_save signal insert a
+blank profile, then ``update_or_create`` it with the submitted details.
+Both flows run through ``CustomUserSerializer`` validation, as
+``POST /api/v1/users/`` does.
+
+Password hashing costs the same in both flows and dominates wall time, so
+by default a fast hasher is used to expose the database work; pass
+``--real-hashing`` to keep the production PBKDF2 hasher.
+
+Usage (from ``backend/``):
+
+    python benchmarks/bench_signup.py --signups 500
+"""
+
+import argparse
+import time
+
+from common import setup_django, test_database
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext, override_settings  # noqa: E402
+
+from core.models import CustomUser, StudentProfile  # noqa: E402
+from core.serializers import CustomUserSerializer  # noqa: E402
+
+
+def legacy_create(validated_data):
+    name = validated_data.pop("name", None)
+    phone = validated_data.pop("phone", None)
+    cgpa = validated_data.pop("cgpa", 0.0)
+    password = validated_data.pop("password")
+    validated_data["is_active"] = True
+    user = CustomUser.objects.create(**validated_data)
+    user.set_password(password)
+    user.save()
+    if name and phone:
+        StudentProfile.objects.update_or_create(
+            user=user, defaults={"full_name": name, "phone": phone, "cgpa": cgpa}
+        )
+    return user
+
+
+def new_create(validated_data):
+    return CustomUserSerializer().create(validated_data)
+
+
+def run(create, prefix, signups):
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        for index in range(signups):
+            serializer = CustomUserSerializer(data={
+                "username": f"{prefix}{index}",
+                "email": f"{prefix}{index}@acropolis.in",
+                "password": "correct-horse-battery",
+                "name": f"Student {index}",
+                "phone": f"98{index:08d}",
+                "cgpa": 7.5,
+            })
+            serializer.is_valid(raise_exception=True)
+            create(serializer.validated_data)
+        elapsed = time.perf_counter() - start
+    writes = sum(query["sql"].split()[0] in ("INSERT", "UPDATE") for query in ctx.captured_queries)
+    return elapsed, len(ctx.captured_queries), writes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signups", type=int, default=500)
+    parser.add_argument("--real-hashing", action="store_true")
+    args = parser.parse_args()
+
+    hashers = {} if args.real_hashing else {
+        "PASSWORD_HASHERS": ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    }
+    with test_database(), override_settings(**hashers):
+        print(f"{'flow':<8} {'signups/s':>10} {'ms/signup':>10} {'queries':>8} {'writes':>7}")
+        results = {}
+        for name, create in [("legacy", legacy_create), ("service", new_create)]:
+            elapsed, queries, writes = run(create, name, args.signups)
+            results[name] = elapsed
+            print(
+                f"{name:<8} {args.signups / elapsed:>10.1f} {elapsed / args.signups * 1000:>10.2f} "
+                f"{queries / args.signups:>8.1f} {writes / args.signups:>7.1f}"
+            )
+        print(f"speedup: {results['legacy'] / results['service']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Concurrent read/write stress test for SQLite, default vs ``SQLITE_TUNED=1``.
+
+For each mode a fresh SQLite file is migrated and seeded, then
+``--processes`` worker processes (standing in for gunicorn workers) run a
+mix of reads (roadmap and skill lists) and read-then-write transactions
+(roadmap saves, skill edits) against it. Reported per mode: throughput,
+"database is locked" errors and p50/p99 operation latency.
+
+Usage (from ``backend/``):
+
+    python benchmarks/bench_sqlite_concurrency.py --processes 6 --ops 300 --write-ratio 0.3
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import BACKEND_DIR
+
+MODES = {"default": "0", "tuned": "1"}
+STUDENTS = 20
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def seed():
+    from core.models import CustomUser, Skill
+
+    for name in ["Python", "Java", "SQL", "Django", "React", "Docker"]:
+        Skill.objects.create(skill_name=name, category="Programming")
+    for index in range(STUDENTS):
+        CustomUser.objects.create_user(f"student{index}", f"student{index}@example.com", "pass12345")
+
+
+def work(args):
+    from django.db import OperationalError, transaction
+
+    from core.models import Roadmap, Skill, StudentProfile
+
+    rng = random.Random(args.worker_id)
+    profile_ids = list(StudentProfile.objects.values_list("pk", flat=True))
+    skill_ids = list(Skill.objects.values_list("pk", flat=True))
+
+    def save_roadmap():
+        with transaction.atomic():
+            profile = StudentProfile.objects.get(pk=rng.choice(profile_ids))
+            Roadmap.objects.create(profile=profile, roadmap_text="1. Learn SQL\n2. Build a project")
+
+    def edit_skill():
+        with transaction.atomic():
+            skill = Skill.objects.get(pk=rng.choice(skill_ids))
+            skill.category = rng.choice(["Programming", "Web", "Databases"])
+            skill.save()
+
+    def read():
+        list(Roadmap.objects.filter(profile_id=rng.choice(profile_ids))[:20])
+        list(Skill.objects.all())
+
+    latencies, errors = [], 0
+    began = time.perf_counter()
+    for _ in range(args.ops):
+        operation = rng.choice([save_roadmap, edit_skill]) if rng.random() < args.write_ratio else read
+        start = time.perf_counter()
+        try:
+            operation()
+        except OperationalError as exc:
+            if "locked" not in str(exc):
+                raise
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - began
+    print(json.dumps({"latencies": latencies, "errors": errors, "elapsed": elapsed}))
+
+
+def run_mode(mode, args, directory):
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{directory}/db.sqlite3",
+        "SQLITE_TUNED": MODES[mode],
+        "CACHE_BACKEND": "locmem",
+    }
+    subprocess.run(
+        [sys.executable, "manage.py", "migrate", "--noinput", "-v", "0"],
+        cwd=BACKEND_DIR, env=env, check=True,
+    )
+    command = [sys.executable, __file__, "--ops", str(args.ops), "--write-ratio", str(args.write_ratio)]
+    subprocess.run(command + ["--role", "seed"], env=env, check=True)
+
+    workers = [
+        subprocess.Popen(
+            command + ["--role", "work", "--worker-id", str(index)],
+            env=env, stdout=subprocess.PIPE, text=True,
+        )
+        for index in range(args.processes)
+    ]
+    results = [json.loads(worker.communicate()[0].strip().splitlines()[-1]) for worker in workers]
+    # Django start-up differs per process; time only the operations.
+    elapsed = max(result["elapsed"] for result in results)
+
+    latencies = [latency for result in results for latency in result["latencies"]]
+    return {
+        "ops_per_sec": len(latencies) / elapsed,
+        "errors": sum(result["errors"] for result in results),
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=6)
+    parser.add_argument("--ops", type=int, default=300, help="operations per process")
+    parser.add_argument("--write-ratio", type=float, default=0.3)
+    parser.add_argument("--role", choices=["seed", "work"], help=argparse.SUPPRESS)
+    parser.add_argument("--worker-id", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.role:
+        from common import setup_django
+
+        setup_django()
+        if args.role == "seed":
+            seed()
+        else:
+            work(args)
+        return
+
+    print(f"{'mode':<8} {'ops/s':>8} {'locked':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode in MODES:
+        with tempfile.TemporaryDirectory() as directory:
+            result = run_mode(mode, args, Path(directory))
+        print(
+            f"{mode:<8} {result['ops_per_sec']:>8.1f} {result['errors']:>7} "
+            f"{result['p50'] * 1000:>8.2f} {result['p99'] * 1000:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
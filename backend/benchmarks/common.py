@@ -0,0 +1,42 @@
+"""
+Shared setup for the benchmark scripts in this directory.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "acroconnect_backend.settings")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database(verbosity=0):
+    """
+    Run the block against a throwaway database created the same way
+    ``manage.py test`` does, so benchmarks never touch real data.
+    """
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=verbosity, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=verbosity)
+        teardown_test_environment()
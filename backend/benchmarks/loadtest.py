@@ -0,0 +1,383 @@
+"""
+End-to-end load test against a local gunicorn server with the LLM stubbed.
+
+Starts the server (``gunicorn.conf.py``, so the production worker setup) on
+a freshly migrated and seeded SQLite file, then runs virtual users that
+replay the Streamlit flows for ``--duration`` seconds:
+
+    student  log in, /users/me/, /pages/student-home/, add and remove a
+             skill, /pages/student-home/ again (the edits drop the app's
+             cached copy), the job board's first compact page and its
+             company list, one posting's details, and every
+             ``--roadmap-every`` iterations generate a roadmap
+    tpo      log in, /users/me/, /pages/tpo-dashboard/ and the first page of
+             its student table, the table sorted by CGPA and filtered by
+             a skill, the first page of their own postings (?tpo_user=),
+             post a job and delete it
+
+Roadmap generation calls a stub in place of Gemini that sleeps
+``--llm-delay`` seconds, so the run needs no network and measures our
+side of the request. Reported per endpoint: requests, throughput,
+p50/p95/p99 latency and errors.
+
+``--save NAME`` writes the results to ``benchmarks/baselines/NAME.json``;
+``--compare NAME`` prints the change against that baseline and exits with
+status 1 if any endpoint's p95 regressed by more than ``--tolerance``.
+
+Usage (from ``backend/``):
+
+    python benchmarks/loadtest.py --students 16 --tpos 2 --duration 30 --save v1.4
+    python benchmarks/loadtest.py --students 16 --tpos 2 --duration 30 --compare v1.4
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from common import BACKEND_DIR
+
+PORT = 8766
+PASSWORD = "pass12345"
+BASELINE_DIR = BACKEND_DIR / "benchmarks" / "baselines"
+
+
+class StubModel:
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def generate_content(self, prompt):
+        time.sleep(float(os.environ.get("LOADTEST_LLM_DELAY", "0.5")))
+        return type("StubResponse", (), {"text": f"Stub roadmap from {self.model_name}.\n\n{prompt[:200]}"})()
+
+
+def stub_application():
+    """gunicorn app factory: the project's WSGI app with Gemini replaced by ``StubModel``."""
+    from common import setup_django
+
+    setup_django()
+    from django.core.wsgi import get_wsgi_application
+
+    from core import views
+
+    views.genai = type("StubGenAI", (), {"GenerativeModel": StubModel})
+    views.GEMINI_AVAILABLE = True
+    return get_wsgi_application()
+
+
+def seed(students, tpos):
+    from core.models import CustomUser, JobPosting, Skill, StudentSkillSet
+    from core.services import register_user
+
+    skills = Skill.objects.bulk_create(
+        Skill(skill_name=f"Skill {i}", category=["Programming", "Web", "Databases"][i % 3]) for i in range(40)
+    )
+    for index in range(students):
+        user = register_user(
+            PASSWORD, username=f"student{index}", email=f"student{index}@example.com",
+            name=f"Student {index}", phone=f"98{index:08d}", cgpa=7.5,
+        )
+        StudentSkillSet.objects.bulk_create(
+            StudentSkillSet(student_profile=user.student_profile, skill=skill, skill_level=3)
+            for skill in skills[index % 5 : 30 : 5]
+        )
+    for index in range(tpos):
+        tpo = CustomUser.objects.create_user(f"tpo{index}", f"tpo{index}@example.com", PASSWORD, is_tpo=True)
+        JobPosting.objects.bulk_create(
+            JobPosting(tpo_user=tpo, title=f"Role {job}", company=f"Company {job % 7}", description="Seeded posting.")
+            for job in range(30)
+        )
+
+
+class Client:
+    """One keep-alive connection that records every request under a label."""
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.token = None
+        self.connection = http.client.HTTPConnection("127.0.0.1", PORT, timeout=120)
+
+    def request(self, method, path, label, body=None, expect=(200,)):
+        headers = {"Accept": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+            body = json.dumps(body)
+        label = f"{method} {label}"
+        start = time.perf_counter()
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            content = response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = http.client.HTTPConnection("127.0.0.1", PORT, timeout=120)
+            self.stats[label]["errors"].append("io")
+            return None
+        self.stats[label]["latencies"].append(time.perf_counter() - start)
+        if response.status not in expect:
+            self.stats[label]["errors"].append(response.status)
+            return None
+        return json.loads(content) if content else {}
+
+    def login(self, username):
+        self.token = None
+        tokens = self.request(
+            "POST", "/api/token/", "/api/token/", {"username": username, "password": PASSWORD}
+        )
+        self.token = tokens and tokens["access"]
+        return self.token is not None
+
+
+def student_scenario(client, index, iteration, args):
+    if not client.login(f"student{index}"):
+        return
+    client.request("GET", "/api/v1/users/me/", "/users/me/")
+    home = client.request("GET", "/api/v1/pages/student-home/", "/pages/student-home/")
+    if home:
+        profile, skills = home["profile"], home["skills"]
+        owned = {entry["skill"]["id"] for entry in profile.get("skill_assignments", [])}
+        available = [skill["id"] for skill in skills if skill["id"] not in owned]
+        if available:
+            created = client.request(
+                "POST", "/api/v1/student-skill-sets/", "/student-skill-sets/",
+                {"student_profile_id": profile["id"], "skill_id": random.choice(available), "skill_level": 2},
+                expect=(201,),
+            )
+            if created:
+                client.request(
+                    "DELETE", f"/api/v1/student-skill-sets/{created['id']}/", "/student-skill-sets/{id}/",
+                    expect=(204,),
+                )
+    client.request("GET", "/api/v1/pages/student-home/", "/pages/student-home/")
+    board = client.request(
+        "GET", "/api/v1/job-postings/?compact=1&page_size=20&page=1", "/job-postings/?compact=1"
+    )
+    client.request("GET", "/api/v1/job-postings/companies/", "/job-postings/companies/")
+    if board and board["results"]:
+        # The oldest row on the page is seeded, so no TPO deletes it mid-run.
+        job_id = board["results"][-1]["id"]
+        client.request("GET", f"/api/v1/job-postings/{job_id}/", "/job-postings/{id}/")
+    if args.roadmap_every and iteration % args.roadmap_every == 0:
+        client.request("POST", "/api/v1/generate-roadmap/", "/generate-roadmap/", {}, expect=(201,))
+
+
+def tpo_scenario(client, index, iteration, args):
+    if not client.login(f"tpo{index}"):
+        return
+    me = client.request("GET", "/api/v1/users/me/", "/users/me/")
+    dashboard = client.request("GET", "/api/v1/pages/tpo-dashboard/", "/pages/tpo-dashboard/")
+    table = "/api/v1/pages/tpo-dashboard/students/?page_size=25"
+    client.request("GET", f"{table}&ordering=name&page=1", "/pages/tpo-dashboard/students/")
+    if dashboard and dashboard["skills"]:
+        skill_id = random.choice(dashboard["skills"])["id"]
+        client.request(
+            "GET", f"{table}&ordering=-cgpa&skill={skill_id}&page=1", "/pages/tpo-dashboard/students/?skill="
+        )
+    if me:
+        client.request(
+            "GET", f"/api/v1/job-postings/?tpo_user={me['id']}&page_size=20&page=1", "/job-postings/?tpo_user="
+        )
+        job = client.request(
+            "POST", "/api/v1/job-postings/", "/job-postings/",
+            {"tpo_user_id": me["id"], "title": f"Engineer {iteration}", "company": "Acme",
+             "description": "Build and ship features."},
+            expect=(201,),
+        )
+        if job:
+            client.request(
+                "DELETE", f"/api/v1/job-postings/{job['id']}/", "/job-postings/{id}/", expect=(204,)
+            )
+
+
+def virtual_user(scenario, index, args, deadline, stats):
+    client = Client(stats)
+    rng = random.Random(index)
+    iteration = 0
+    while time.monotonic() < deadline:
+        iteration += 1
+        scenario(client, index, iteration, args)
+        if args.think:
+            time.sleep(rng.uniform(0, args.think))
+    client.connection.close()
+
+
+def wait_for_server(timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", PORT), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+
+def summarize(per_user_stats, duration):
+    merged = defaultdict(lambda: {"latencies": [], "errors": []})
+    for stats in per_user_stats:
+        for label, entry in stats.items():
+            merged[label]["latencies"] += entry["latencies"]
+            merged[label]["errors"] += entry["errors"]
+    results = {}
+    for label, entry in sorted(merged.items(), key=lambda item: item[0].split(" ", 1)[::-1]):
+        latencies = sorted(entry["latencies"])
+        results[label] = {
+            "requests": len(latencies) + entry["errors"].count("io"),
+            "rps": len(latencies) / duration,
+            "p50": percentile(latencies, 0.50) if latencies else None,
+            "p95": percentile(latencies, 0.95) if latencies else None,
+            "p99": percentile(latencies, 0.99) if latencies else None,
+            "errors": len(entry["errors"]),
+        }
+    return results
+
+
+def print_results(results):
+    fmt = lambda value: f"{value:.1f}" if value is not None else "-"  # noqa: E731
+    print(f"{'endpoint':<46} {'reqs':>6} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for label, row in results.items():
+        print(
+            f"{label:<46} {row['requests']:>6} {row['rps']:>7.1f} {fmt(row['p50']):>8} "
+            f"{fmt(row['p95']):>8} {fmt(row['p99']):>8} {row['errors']:>7}"
+        )
+    total = sum(row["requests"] for row in results.values())
+    errors = sum(row["errors"] for row in results.values())
+    print(f"{'total':<46} {total:>6} {sum(row['rps'] for row in results.values()):>7.1f} {'':>26} {errors:>7}")
+
+
+def compare(results, baseline, tolerance):
+    """Print p95 changes against ``baseline``; returns the regressed endpoints."""
+    regressed = []
+    print(f"\n{'endpoint':<46} {'base p95':>9} {'p95':>8} {'change':>8} {'base err':>9} {'errors':>7}")
+    for label, row in results.items():
+        base = baseline["results"].get(label)
+        if base is None or base["p95"] is None or row["p95"] is None:
+            print(f"{label:<46} {'new':>9}")
+            continue
+        change = row["p95"] / base["p95"] - 1
+        flag = ""
+        if change > tolerance or row["errors"] > base["errors"]:
+            regressed.append(label)
+            flag = "  REGRESSED"
+        print(
+            f"{label:<46} {base['p95']:>9.1f} {row['p95']:>8.1f} {change:>+8.0%} "
+            f"{base['errors']:>9} {row['errors']:>7}{flag}"
+        )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=16, help="concurrent student users")
+    parser.add_argument("--tpos", type=int, default=2, help="concurrent TPO users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--think", type=float, default=0.0, help="max random pause between iterations")
+    parser.add_argument("--roadmap-every", type=int, default=5, help="generate a roadmap every N student iterations (0: never)")
+    parser.add_argument("--llm-delay", type=float, default=0.5, help="seconds the stubbed LLM takes")
+    parser.add_argument("--workers", type=int, default=3, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads per worker")
+    parser.add_argument("--save", metavar="NAME", help="save the results as a baseline")
+    parser.add_argument("--compare", metavar="NAME", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 increase (0.2 = 20%%)")
+    parser.add_argument("--seed", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed:
+        from common import setup_django
+
+        setup_django()
+        seed(args.students, args.tpos)
+        return
+
+    if shutil.which("gunicorn") is None:
+        sys.exit("gunicorn is not installed")
+    baseline = None
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text())
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{directory}/db.sqlite3",
+            "SQLITE_TUNED": "1",
+            # Shared between workers, so invalidation reaches all of them.
+            "CACHE_BACKEND": "file",
+            "CACHE_DIR": f"{directory}/cache",
+            "RESPONSE_CACHE_DIR": f"{directory}/response-cache",
+            "GUNICORN_BIND": f"127.0.0.1:{PORT}",
+            "GUNICORN_WORKERS": str(args.workers),
+            "GUNICORN_THREADS": str(args.threads),
+            "GUNICORN_TIMEOUT": "120",
+            "LOADTEST_LLM_DELAY": str(args.llm_delay),
+        }
+        subprocess.run(
+            [sys.executable, "manage.py", "migrate", "--noinput", "-v", "0"],
+            cwd=BACKEND_DIR, env=env, check=True,
+        )
+        subprocess.run(
+            [sys.executable, __file__, "--seed", "--students", str(args.students), "--tpos", str(args.tpos)],
+            env=env, check=True,
+        )
+        server = subprocess.Popen(
+            ["gunicorn", "loadtest:stub_application()", "--pythonpath", "benchmarks", "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env,
+        )
+        try:
+            wait_for_server()
+            users = [(student_scenario, index) for index in range(args.students)]
+            users += [(tpo_scenario, index) for index in range(args.tpos)]
+            per_user_stats = [defaultdict(lambda: {"latencies": [], "errors": []}) for _ in users]
+            deadline = time.monotonic() + args.duration
+            threads = [
+                threading.Thread(target=virtual_user, args=(scenario, index, args, deadline, stats))
+                for (scenario, index), stats in zip(users, per_user_stats)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            server.terminate()
+            server.wait()
+
+    results = summarize(per_user_stats, args.duration)
+    print_results(results)
+
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save}.json"
+        path.write_text(json.dumps({
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "host": platform.node(),
+            "config": {key: value for key, value in vars(args).items() if key not in ("save", "compare", "seed")},
+            "results": results,
+        }, indent=2) + "\n")
+        print(f"\nbaseline saved to {path.relative_to(BACKEND_DIR)}")
+
+    if baseline is not None:
+        if baseline["config"] != {key: value for key, value in vars(args).items() if key not in ("save", "compare", "seed")}:
+            print("\nwarning: baseline was recorded with different options")
+        regressed = compare(results, baseline, args.tolerance)
+        if regressed:
+            sys.exit(f"\n{len(regressed)} endpoint(s) regressed")
+
+
+if __name__ == "__main__":
+    main()
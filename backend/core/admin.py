@@ -1,6 +1,14 @@
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-
+from django.core.paginator import Paginator
+from django.http import FileResponse, Http404
+from django.template.response import TemplateResponse
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils.functional import cached_property
+
+from . import profiling
 from .models import (
     CustomUser,
     Skill,
@@ -12,6 +20,78 @@ from .models import (
 )
 
 
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never counts a whole large table. Unfiltered changelists
+    on PostgreSQL use the planner's row estimate; everything else is counted
+    up to ``COUNT_LIMIT`` rows, so past that only the first pages are listed.
+    """
+
+    COUNT_LIMIT = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = self.estimated_rows(queryset)
+            if estimate is not None and estimate > self.COUNT_LIMIT:
+                return estimate
+        return queryset.order_by()[: self.COUNT_LIMIT].count()
+
+    @staticmethod
+    def estimated_rows(queryset):
+        from django.db import connections
+
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+
+class ScalableAdminMixin:
+    """
+    Changelist settings for tables with hundreds of thousands of rows.
+
+    Search is a case-insensitive prefix match on ``prefix_search_fields``
+    (each backed by a ``Lower()`` index): terms containing "@" match the
+    fields ending in "email", other terms the remaining fields, so every
+    search stays on an index instead of scanning with ``icontains``.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    prefix_search_fields = ()
+
+    def get_search_fields(self, request):
+        return self.prefix_search_fields
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip().lower()
+        if not term:
+            return queryset, False
+        is_email = "@" in term
+        fields = [field for field in self.prefix_search_fields if field.endswith("email") == is_email]
+        if not fields:
+            return queryset.none(), False
+
+        # The range lets the database walk the index; startswith keeps the
+        # match exact under non-C collations.
+        upper = term[:-1] + chr(ord(term[-1]) + 1)
+        condition = Q()
+        for index, field in enumerate(fields):
+            alias = f"_prefix_{index}"
+            queryset = queryset.alias(**{alias: Lower(field)})
+            condition |= Q(**{f"{alias}__gte": term, f"{alias}__lt": upper, f"{alias}__startswith": term})
+        # All searched relations are to-one, so no duplicates.
+        return queryset.filter(condition), False
+
+
 class StudentSkillSetInline(admin.TabularInline):
     model = StudentSkillSet
     extra = 1
@@ -31,31 +111,86 @@ class SkillAdmin(admin.ModelAdmin):
 
 
 @admin.register(CustomUser)
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(ScalableAdminMixin, UserAdmin):
     model = CustomUser
     list_display = ("username", "email", "is_tpo")
+    prefix_search_fields = ("username", "email")
     fieldsets = UserAdmin.fieldsets + ((None, {"fields": ("is_tpo",)}),)
     add_fieldsets = UserAdmin.add_fieldsets + ((None, {"fields": ("is_tpo",)}),)
 
 
 @admin.register(StudentProfile)
-class StudentProfileAdmin(admin.ModelAdmin):
+class StudentProfileAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ("full_name", "email", "cgpa")
-    search_fields = ("full_name", "user__email")
+    list_select_related = ("user",)
+    prefix_search_fields = ("full_name", "user__email")
+    raw_id_fields = ("user",)
     inlines = [StudentSkillSetInline]
 
-    @admin.display(description="Email")
+    @admin.display(description="Email", ordering="user__email")
     def email(self, obj):
         return obj.user.email
 
 
 @admin.register(JobPosting)
-class JobPostingAdmin(admin.ModelAdmin):
+class JobPostingAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ("title", "company", "posted_on")
-    search_fields = ("title", "company", "tpo_user__username", "tpo_user__email")
+    prefix_search_fields = ("title", "company", "tpo_user__email")
+    raw_id_fields = ("tpo_user",)
     inlines = [RequiredSkillInline]
 
 
-admin.site.register(StudentSkillSet)
-admin.site.register(RequiredSkill)
-admin.site.register(Roadmap)
+@admin.register(StudentSkillSet)
+class StudentSkillSetAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    list_display = ("student_profile", "skill", "skill_level")
+    list_select_related = ("student_profile", "skill")
+    raw_id_fields = ("student_profile",)
+    autocomplete_fields = ["skill"]
+
+
+@admin.register(RequiredSkill)
+class RequiredSkillAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    list_display = ("job_posting", "skill", "required_level")
+    list_select_related = ("job_posting", "skill")
+    raw_id_fields = ("job_posting",)
+    autocomplete_fields = ["skill"]
+
+
+@admin.register(Roadmap)
+class RoadmapAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    list_display = ("profile", "generated_on")
+    list_select_related = ("profile",)
+    raw_id_fields = ("profile",)
+
+
+def profile_list(request):
+    """Captured request profiles, newest first (see core/profiling.py)."""
+    context = {
+        **admin.site.each_context(request),
+        "title": "Request profiles",
+        "captures": profiling.list_captures(),
+        "keep": settings.PROFILE_KEEP,
+    }
+    return TemplateResponse(request, "admin/core/profiles/index.html", context)
+
+
+def profile_detail(request, name):
+    capture = profiling.load_capture(name)
+    if capture is None:
+        raise Http404("No such profile.")
+    context = {
+        **admin.site.each_context(request),
+        "title": f"{capture['method']} {capture['path']}",
+        "capture": capture,
+        "stats": profiling.stats_text(capture) if capture["mode"] == "cprofile" else None,
+    }
+    return TemplateResponse(request, "admin/core/profiles/detail.html", context)
+
+
+def profile_download(request, name):
+    capture = profiling.load_capture(name)
+    if capture is None or not profiling.profile_path(capture).exists():
+        raise Http404("No such profile.")
+    return FileResponse(
+        profiling.profile_path(capture).open("rb"), as_attachment=True, filename=capture["profile_file"]
+    )
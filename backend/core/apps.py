@@ -6,4 +6,5 @@ class CoreConfig(AppConfig):
     name = 'core'
 
     def ready(self):
+        import core.db  # noqa
         import core.signals  # noqa
\ No newline at end of file
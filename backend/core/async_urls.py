@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import async_views
+
+urlpatterns = [
+    path("skills/", async_views.skill_list, name="async-skill-list"),
+    path("job-postings/", async_views.job_posting_list, name="async-jobposting-list"),
+    path("roadmaps/", async_views.roadmap_list, name="async-roadmap-list"),
+    path("users/me/", async_views.current_user, name="async-current-user"),
+    path("student-profiles/me/", async_views.current_profile, name="async-studentprofile-me"),
+]
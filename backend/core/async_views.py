@@ -0,0 +1,181 @@
+"""
+Async versions of the hot read endpoints, for serving under ASGI.
+
+Each view returns the same body as its DRF counterpart (``/api/v1/async/``
+mirrors ``/api/v1/``) but awaits the cache and the async ORM instead of
+holding a worker thread, so slow clients and slow queries do not tie up
+the server. DRF views are sync-only, so authentication and error responses
+are handled by ``async_api_view`` here, and the format (JSON or MessagePack)
+is picked by DRF's content negotiation, as for the sync views.
+
+Serve with ``uvicorn acroconnect_backend.asgi:application`` or
+``gunicorn acroconnect_backend.asgi:application -k uvicorn.workers.UvicornWorker``.
+"""
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.shortcuts import aget_object_or_404
+from rest_framework import exceptions
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.request import Request
+
+from . import cache as me_cache
+from . import response_cache
+from .authentication import ClaimsJWTAuthentication
+from .db_routers import primary
+from .models import CustomUser, StudentProfile
+from .renderers import FastJSONRenderer, MessagePackRenderer
+from .serializers import (
+    CustomUserSerializer,
+    RoadmapSerializer,
+    SkillSerializer,
+    StudentProfileSerializer,
+)
+from .views import JobPostingViewSet, RoadmapViewSet, SkillViewSet, StudentProfileViewSet
+
+authentication = ClaimsJWTAuthentication()
+negotiation = DefaultContentNegotiation()
+RENDERERS = (FastJSONRenderer(), MessagePackRenderer())
+
+
+def negotiate(request, force=False):
+    """
+    Return the ``(renderer, media_type)`` DRF would pick for ``request``
+    (``Accept`` or ``?format=``). With ``force``, fall back to JSON
+    instead of raising, as DRF does when rendering errors.
+    """
+    try:
+        return negotiation.select_renderer(Request(request), RENDERERS)
+    except (exceptions.NotAcceptable, Http404):
+        if not force:
+            raise
+        return RENDERERS[0], RENDERERS[0].media_type
+
+
+def render(request, data, status=200, force=False):
+    renderer, media_type = negotiate(request, force)
+    return HttpResponse(renderer.render(data, media_type), status=status, content_type=renderer.media_type)
+
+
+def error_response(request, exc):
+    # Same body shape as rest_framework.views.exception_handler.
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    response = render(request, data, exc.status_code, force=True)
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        response["WWW-Authenticate"] = authentication.authenticate_header(request)
+    return response
+
+
+def async_api_view(view):
+    """
+    Allow only GET from authenticated users, as ``IsAuthenticated`` does
+    for the DRF views, and turn API errors into DRF-style responses.
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            if request.method != "GET":
+                raise exceptions.MethodNotAllowed(request.method)
+            result = await authentication.aauthenticate(request)
+            if result is None:
+                raise exceptions.NotAuthenticated()
+            request.user, request.auth = result
+            return await view(request, *args, **kwargs)
+        except Http404 as exc:
+            return error_response(request, exceptions.NotFound(*exc.args))
+        except exceptions.APIException as exc:
+            return error_response(request, exc)
+
+    return wrapper
+
+
+async def cached_response(request, parts, tags, build):
+    """
+    Serve from the response cache (see ``core.response_cache``), calling
+    ``build()`` for the data on a miss. Entries are kept apart from
+    ``CachedResponseMixin``'s under an ``async`` prefix, so a difference
+    between the two builders can never leak across endpoints.
+    """
+    cache = response_cache.get_cache()
+    renderer, media_type = negotiate(request)
+    key = response_cache.make_key(
+        ["async", *parts, response_cache.format_key(renderer, media_type), response_cache.query_key(request)],
+        await response_cache.atag_versions(tags),
+    )
+    entry = await cache.aget(key)
+    if entry is not None:
+        return response_cache.respond(request, entry, hit=True)
+    with primary():
+        data = await build()
+    entry = response_cache.build_entry(render(request, data))
+    await cache.aset(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+    return response_cache.respond(request, entry, hit=False)
+
+
+async def serialize_all(serializer_class, queryset):
+    return serializer_class([obj async for obj in queryset], many=True).data
+
+
+def viewset_list_data(viewset_class, request):
+    """
+    The body ``viewset_class`` lists for ``request``: its queryset, filters,
+    ordering and pagination, without the DRF view around them.
+    """
+    view = viewset_class(action="list", args=(), kwargs={}, format_kwarg=None)
+    view.request = Request(request)
+    return view.list_data()
+
+
+@async_api_view
+async def skill_list(request):
+    return await cached_response(
+        request,
+        ["skill", "list", ""],
+        SkillViewSet.cache_tags["list"],
+        lambda: serialize_all(SkillSerializer, SkillViewSet.queryset.all()),
+    )
+
+
+@async_api_view
+async def job_posting_list(request):
+    return await cached_response(
+        request,
+        ["jobposting", "list", ""],
+        JobPostingViewSet.cache_tags["list"],
+        sync_to_async(lambda: viewset_list_data(JobPostingViewSet, request)),
+    )
+
+
+@async_api_view
+async def roadmap_list(request):
+    return render(request, await serialize_all(RoadmapSerializer, RoadmapViewSet.queryset.all()))
+
+
+@async_api_view
+async def current_user(request):
+    async def build():
+        return CustomUserSerializer(await CustomUser.objects.aget(pk=request.user.pk)).data
+
+    return render(request, await me_cache.aget_user_payload(request.user.pk, build))
+
+
+@async_api_view
+async def current_profile(request):
+    profile_id = getattr(request.user, "profile_id", None)
+    if profile_id is None:
+        profile_id = await StudentProfile.objects.filter(user_id=request.user.pk).values_list(
+            "pk", flat=True
+        ).afirst()
+        if profile_id is None:
+            raise Http404("No StudentProfile matches the given query.")
+
+    async def build():
+        profile = await aget_object_or_404(StudentProfileViewSet.queryset.all(), pk=profile_id)
+        return StudentProfileSerializer(profile).data
+
+    return render(request, await me_cache.aget_profile_payload(profile_id, build))
@@ -0,0 +1,161 @@
+"""
+Stateless JWT authentication.
+
+Access tokens carry the claims most requests need (role, email, profile id)
+plus a token version. ``ClaimsJWTAuthentication`` builds the request user
+from those claims without touching the database; the full ``CustomUser`` is
+loaded lazily the first time a view reads anything else from it.
+
+The token version is bumped whenever a user's role or active flag changes
+(see ``CustomUser.save``). The current version of every user is kept in the
+cache, so revoked tokens are rejected without a query on warm requests.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import CustomUser, StudentProfile
+
+TOKEN_VERSION_CLAIM = "ver"
+
+# Version stored for deleted or inactive users; never matches a real token.
+REVOKED = -1
+
+
+def token_version_cache_key(user_id):
+    return f"auth:token-version:{user_id}"
+
+
+def remember_token_version(user):
+    """Publish ``user``'s current token version to the cache."""
+    version = user.token_version if user.is_active else REVOKED
+    cache.set(token_version_cache_key(user.pk), version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+
+
+def forget_token_version(user_id):
+    cache.set(token_version_cache_key(user_id), REVOKED, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+
+
+def get_token_version(user_id):
+    key = token_version_cache_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        row = CustomUser.objects.filter(pk=user_id).values_list("token_version", "is_active").first()
+        version = row[0] if row and row[1] else REVOKED
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+async def aget_token_version(user_id):
+    key = token_version_cache_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        row = await CustomUser.objects.filter(pk=user_id).values_list("token_version", "is_active").afirst()
+        version = row[0] if row and row[1] else REVOKED
+        await cache.aset(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def add_user_claims(token, user):
+    """Embed the claims ``ClaimsUser`` is built from into ``token``."""
+    token["email"] = user.email
+    token["is_tpo"] = user.is_tpo
+    token["is_staff"] = user.is_staff
+    token["profile_id"] = (
+        StudentProfile.objects.filter(user_id=user.pk).values_list("pk", flat=True).first()
+    )
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    Request user backed by access-token claims.
+
+    ``id``/``pk``, ``email``, ``is_tpo``, ``is_staff`` and ``profile_id`` are
+    answered from the token; any other attribute loads the ``CustomUser``
+    once and proxies to it, so the object can be used like a regular user.
+    """
+
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, claims):
+        user_id = int(claims[api_settings.USER_ID_CLAIM])
+        super().__init__(lambda: CustomUser.objects.get(pk=user_id))
+        self.__dict__.update(
+            _claims=claims,
+            id=user_id,
+            pk=user_id,
+            email=claims["email"],
+            is_tpo=claims["is_tpo"],
+            is_staff=claims.get("is_staff", False),
+            profile_id=claims.get("profile_id"),
+        )
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, (ClaimsUser, CustomUser)):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __copy__(self):
+        return type(self)(self._claims)
+
+    def __deepcopy__(self, memo):
+        return type(self)(dict(self._claims))
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that returns a ``ClaimsUser`` instead of querying
+    ``CustomUser``. Tokens issued before claims were added fall back to the
+    regular database lookup. ``aauthenticate`` is the same check for the
+    async views, which do not go through DRF.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if validated_token[TOKEN_VERSION_CLAIM] != get_token_version(user_id):
+            raise AuthenticationFailed(_("Token has been revoked."), code="token_revoked")
+
+        return ClaimsUser(validated_token.payload)
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if validated_token[TOKEN_VERSION_CLAIM] != await aget_token_version(user_id):
+            raise AuthenticationFailed(_("Token has been revoked."), code="token_revoked")
+
+        return ClaimsUser(validated_token.payload)
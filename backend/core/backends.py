@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+UserModel = get_user_model()
+
+
+class UsernameOrEmailBackend(ModelBackend):
+    """
+    Authenticates with either the username or the email address.
+
+    The user is resolved with one query that can use the username unique
+    index and the ``LOWER(email)`` index, so emails match case-insensitively,
+    and the password is hashed exactly once per attempt.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        candidates = list(
+            UserModel._default_manager.annotate(email_lower=Lower("email"))
+            .filter(Q(username=username) | Q(email_lower=username.lower()))[:2]
+        )
+        # A username match wins over someone else's email that happens to equal it.
+        user = next((c for c in candidates if c.username == username), None)
+        if user is None and candidates:
+            user = candidates[0]
+
+        if user is None:
+            # Run the hasher anyway so unknown accounts take as long as wrong
+            # passwords (same mitigation as ModelBackend).
+            UserModel().set_password(password)
+            return None
+
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
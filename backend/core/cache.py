@@ -0,0 +1,105 @@
+"""
+Per-user cache of the serialized ``/me`` payloads.
+
+``/users/me/`` is cached per user id and ``/student-profiles/me/`` per
+profile id. Entries are dropped by the signal receivers in ``signals.py``
+whenever the underlying user, profile or skill assignments change. Renaming
+or deleting a ``Skill`` touches every profile that uses it, so instead of
+finding those entries a global generation that is part of every key is
+replaced. Drops happen once the writing transaction commits, so a concurrent
+read cannot re-cache the pre-commit data. Payloads are always built from
+the primary database.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .db_routers import primary
+
+GENERATION_KEY = "me:generation"
+
+
+# Generations are timestamps rather than counters (as in response_cache), so
+# an evicted generation key can never come back with a value old entries
+# were stored under.
+
+def _generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = time.time_ns()
+        if not cache.add(GENERATION_KEY, generation, None):
+            generation = cache.get(GENERATION_KEY, generation)
+    return generation
+
+
+async def _ageneration():
+    generation = await cache.aget(GENERATION_KEY)
+    if generation is None:
+        generation = time.time_ns()
+        if not await cache.aadd(GENERATION_KEY, generation, None):
+            generation = await cache.aget(GENERATION_KEY, generation)
+    return generation
+
+
+def user_key(user_id, generation=None):
+    return f"me:user:{user_id}:{_generation() if generation is None else generation}"
+
+
+def profile_key(profile_id, generation=None):
+    return f"me:profile:{profile_id}:{_generation() if generation is None else generation}"
+
+
+def get_or_build(key, build):
+    """
+    Return the cached payload for ``key``, building and storing it with
+    ``build()`` on a miss.
+    """
+    data = cache.get(key)
+    if data is None:
+        # Store a plain dict: ReturnDict keeps a reference to its serializer.
+        with primary():
+            data = dict(build())
+        cache.set(key, data, settings.ME_CACHE_TIMEOUT)
+    return data
+
+
+async def aget_or_build(key, build):
+    """``get_or_build`` for the async views; ``build`` is a coroutine function."""
+    data = await cache.aget(key)
+    if data is None:
+        with primary():
+            data = dict(await build())
+        await cache.aset(key, data, settings.ME_CACHE_TIMEOUT)
+    return data
+
+
+def get_user_payload(user_id, build):
+    return get_or_build(user_key(user_id), build)
+
+
+def get_profile_payload(profile_id, build):
+    return get_or_build(profile_key(profile_id), build)
+
+
+async def aget_user_payload(user_id, build):
+    return await aget_or_build(user_key(user_id, await _ageneration()), build)
+
+
+async def aget_profile_payload(profile_id, build):
+    return await aget_or_build(profile_key(profile_id, await _ageneration()), build)
+
+
+def invalidate_user(user_id):
+    transaction.on_commit(lambda: cache.delete(user_key(user_id)))
+
+
+def invalidate_profile(profile_id):
+    transaction.on_commit(lambda: cache.delete(profile_key(profile_id)))
+
+
+def invalidate_all():
+    """Retire every cached payload at once (used when a Skill changes)."""
+    transaction.on_commit(lambda: cache.set(GENERATION_KEY, time.time_ns(), None))
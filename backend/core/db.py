@@ -0,0 +1,38 @@
+"""
+Per-connection database setup.
+
+Every connection gets the request metrics and tracing query hooks. When
+``settings.SQLITE_PRAGMAS`` is non-empty (``SQLITE_TUNED=1``) every new
+SQLite connection gets those pragmas, e.g. WAL journaling so readers no
+longer block the writer and ``busy_timeout`` so a writer waits for the lock
+instead of failing immediately.
+"""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from . import metrics, tracing
+
+
+@receiver(connection_created)
+def install_query_metrics(sender, connection, **kwargs):
+    # The wrapper list outlives reconnects, so only add the hook once.
+    if metrics.db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(metrics.db_wrapper)
+
+
+@receiver(connection_created)
+def install_query_tracing(sender, connection, **kwargs):
+    # Returns straight away outside sampled requests.
+    if tracing.db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(tracing.db_wrapper)
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != "sqlite" or not settings.SQLITE_PRAGMAS:
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,147 @@
+"""
+Read-replica routing.
+
+When ``DATABASE_REPLICA_URL`` is set, ``ReplicaRouter`` sends ORM reads made
+while serving a GET/HEAD/OPTIONS request to the ``replica`` alias and
+everything else to ``default``. ``ReplicaRoutingMiddleware`` (in
+``core/middleware.py``) decides per request:
+
+* unsafe methods read from the primary, and pin their user to the primary
+  for ``REPLICA_PIN_SECONDS`` after a successful write, so the user reads
+  their own writes even if the replica has not caught up;
+* tokens issued within the pin window read from the primary too, which
+  covers reading back a profile created just before logging in;
+* once a request writes, the rest of it reads from the primary;
+* code that fills the shared caches reads inside ``primary()``, so a
+  lagging replica cannot put stale data back into a just-invalidated entry.
+
+The user is taken from the bearer token without verifying it. Routing is
+only a hint: a forged token can at worst send reads to the primary, and
+the view still authenticates the request as usual.
+
+Code running outside a request (management commands, the shell) always
+uses the primary.
+"""
+
+import base64
+import contextvars
+import json
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import ReplicaHeartbeat
+
+REPLICA_ALIAS = "replica"
+
+
+class RoutingState:
+    __slots__ = ("use_replica",)
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+
+
+_state = contextvars.ContextVar("acroconnect_db_routing", default=None)
+
+
+@contextmanager
+def primary():
+    """Read from the primary inside the block."""
+    token = _state.set(RoutingState(False))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+def pin_key(user_id):
+    return f"db:pin:{user_id}"
+
+
+def pin_user(user_id):
+    cache.set(pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def token_claims(request):
+    """Claims of the request's bearer token, unverified; ``{}`` if there is none."""
+    parts = request.headers.get("Authorization", "").split()
+    if len(parts) != 2 or parts[0] not in api_settings.AUTH_HEADER_TYPES:
+        return {}
+    try:
+        payload = parts[1].split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (IndexError, ValueError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+def reads_from_replica(request, claims):
+    if request.method not in SAFE_METHODS:
+        return False
+    user_id = claims.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return True
+    issued_at = claims.get("iat")
+    if isinstance(issued_at, (int, float)) and time.time() - issued_at < settings.REPLICA_PIN_SECONDS:
+        return False
+    return not cache.get(pin_key(user_id))
+
+
+def begin_request(request, claims):
+    """Set the routing state for ``request``; returns the token to reset it with."""
+    return _state.set(RoutingState(reads_from_replica(request, claims)))
+
+
+def end_request(token, request, claims, response):
+    """
+    Reset the routing state and pin the user after a write. ``response`` is
+    ``None`` when the request raised, which may still have written.
+    """
+    _state.reset(token)
+    user_id = claims.get(api_settings.USER_ID_CLAIM)
+    if request.method in SAFE_METHODS or user_id is None:
+        return
+    if response is None or response.status_code < 400:
+        pin_user(user_id)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is not None and state.use_replica:
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.use_replica = False
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives the schema from the primary.
+        return db != REPLICA_ALIAS
+
+
+def replica_lag_seconds():
+    """
+    Age of the newest heartbeat on the replica, or ``None`` without a
+    replica or heartbeat. Includes up to one heartbeat interval.
+    """
+    if REPLICA_ALIAS not in settings.DATABASES:
+        return None
+    beat = ReplicaHeartbeat.objects.using(REPLICA_ALIAS).values_list("beat", flat=True).first()
+    if beat is None:
+        return None
+    return max(0.0, (timezone.now() - beat).total_seconds())
@@ -0,0 +1,176 @@
+"""
+Read-only list builders that skip ``ModelSerializer``.
+
+``StudentProfileSerializer`` and ``JobPostingSerializer`` instantiate model
+objects plus nested serializer fields for every row, which dominates CPU
+time on long lists. The builders here fetch the same columns with
+``values()`` (the owner's user joined in), fetch all nested skills in one
+more query, and assemble plain dicts with the serializers' exact keys,
+order and value formatting. ``FastListTests`` in ``core/tests.py`` checks
+that both paths render to identical bytes; keep them in step when a
+serializer's fields change.
+"""
+
+from collections import defaultdict
+
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from . import metrics
+from .models import RequiredSkill, StudentSkillSet
+
+# Readable fields of CustomUserSerializer, in order.
+USER_FIELDS = ("id", "username", "email", "first_name", "last_name", "is_tpo", "is_active")
+
+# Formats datetimes exactly like the serializers' DateTimeField.
+_datetime = serializers.DateTimeField()
+
+
+def format_datetime(value):
+    return _datetime.to_representation(value)
+
+
+def _user(row, prefix):
+    return {name: row[f"{prefix}__{name}"] for name in USER_FIELDS}
+
+
+def _skills_by_owner(model, owner_field, level_field, owners):
+    """
+    ``{owner id: [skill assignment dict, ...]}`` in one query. ``owners`` is
+    a queryset, used as a subquery so long lists stay within the database's
+    parameter limit.
+    """
+    owner_id = f"{owner_field}_id"
+    rows = (
+        model.objects.filter(**{f"{owner_id}__in": owners.order_by().values("pk")})
+        .order_by("pk")
+        .values_list("id", owner_id, "skill_id", "skill__skill_name", "skill__category", level_field)
+    )
+    grouped = defaultdict(list)
+    for pk, owner, skill_id, skill_name, category, level in rows:
+        grouped[owner].append({
+            "id": pk,
+            owner_field: owner,
+            "skill": {"id": skill_id, "skill_name": skill_name, "category": category},
+            level_field: level,
+        })
+    return grouped
+
+
+def student_profiles(queryset):
+    """Same data as ``StudentProfileSerializer(queryset, many=True).data``."""
+    with metrics.serializer_timer("fast student_profiles"):
+        rows = list(queryset.prefetch_related(None).values(
+            "id", "full_name", "phone", "cgpa", "resume_url", "career_goal",
+            *(f"user__{name}" for name in USER_FIELDS),
+        ))
+        skills = _skills_by_owner(StudentSkillSet, "student_profile", "skill_level", queryset)
+        return [
+            {
+                "id": row["id"],
+                "user": _user(row, "user"),
+                "full_name": row["full_name"],
+                "phone": row["phone"],
+                "cgpa": row["cgpa"],
+                "resume_url": row["resume_url"],
+                "career_goal": row["career_goal"],
+                "skill_assignments": skills.get(row["id"], []),
+            }
+            for row in rows
+        ]
+
+
+def job_postings(queryset):
+    """Same data as ``JobPostingSerializer(queryset, many=True).data``."""
+    with metrics.serializer_timer("fast job_postings"):
+        rows = list(queryset.prefetch_related(None).values(
+            "id", "title", "company", "description", "posted_on",
+            *(f"tpo_user__{name}" for name in USER_FIELDS),
+        ))
+        skills = _skills_by_owner(RequiredSkill, "job_posting", "required_level", queryset)
+        return [
+            {
+                "id": row["id"],
+                "tpo_user": _user(row, "tpo_user"),
+                "title": row["title"],
+                "company": row["company"],
+                "description": row["description"],
+                "posted_on": format_datetime(row["posted_on"]),
+                "required_skills": skills.get(row["id"], []),
+            }
+            for row in rows
+        ]
+
+
+def job_posting_summaries(queryset):
+    """Job board rows: the posting without its description and skills."""
+    with metrics.serializer_timer("fast job_posting_summaries"):
+        return [
+            {**row, "posted_on": format_datetime(row["posted_on"])}
+            for row in queryset.prefetch_related(None).values("id", "title", "company", "posted_on")
+        ]
+
+
+def student_table_rows(queryset):
+    """
+    Rows of the TPO dashboard's student table, for one page of profiles:
+    the profile's columns, the user's email and the skill names.
+    """
+    with metrics.serializer_timer("fast student_table_rows"):
+        rows = list(queryset.values(
+            "id", "user_id", "full_name", "user__email", "phone", "cgpa", "skill_count",
+        ))
+        names = defaultdict(list)
+        skills = (
+            StudentSkillSet.objects.filter(student_profile_id__in=[row["id"] for row in rows])
+            .order_by("pk")
+            .values_list("student_profile_id", "skill__skill_name")
+        )
+        for profile_id, skill_name in skills:
+            names[profile_id].append(skill_name)
+        return [
+            {
+                "id": row["id"],
+                "user_id": row["user_id"],
+                "full_name": row["full_name"],
+                "email": row["user__email"],
+                "phone": row["phone"],
+                "cgpa": row["cgpa"],
+                "skill_count": row["skill_count"],
+                "skills": names[row["id"]],
+            }
+            for row in rows
+        ]
+
+
+class FastListMixin:
+    """
+    Serve ``list`` from ``fast_list(queryset)`` instead of the serializer;
+    other actions keep the serializer. With ``?compact=1`` the viewset's
+    ``compact_list`` builder, if it has one, is used instead.
+
+    Paginated lists paginate the primary keys first and build only the
+    page's rows, in page order.
+    """
+
+    fast_list = None
+    compact_list = None
+
+    def get_list_builder(self):
+        if self.compact_list is not None and self.request.query_params.get("compact") == "1":
+            return self.compact_list
+        return self.fast_list
+
+    def list(self, request, *args, **kwargs):
+        return Response(self.list_data())
+
+    def list_data(self):
+        """The ``list`` body: a plain array, or a page of it when paginated."""
+        build = self.get_list_builder()
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset.values_list("pk", flat=True))
+        if page is None:
+            return build(queryset)
+        # The page's keys already satisfy the filters; don't evaluate them twice.
+        rows = {row["id"]: row for row in build(self.queryset.filter(pk__in=page))}
+        return self.get_paginated_response([rows[pk] for pk in page]).data
@@ -0,0 +1,231 @@
+import math
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core import cache as me_cache
+from core import response_cache
+from core import services
+from core.models import (
+    CustomUser,
+    JobPosting,
+    RequiredSkill,
+    Roadmap,
+    Skill,
+    StudentProfile,
+    StudentSkillSet,
+)
+
+USERNAME_PREFIX = "bench_"
+
+# The most popular skills, most popular first; the rest are numbered.
+KNOWN_SKILLS = [
+    ("Python", "Programming"), ("SQL", "Databases"), ("Java", "Programming"),
+    ("JavaScript", "Programming"), ("Git", "Tools"), ("HTML", "Web"), ("CSS", "Web"),
+    ("C++", "Programming"), ("React", "Web"), ("Data Structures", "Fundamentals"),
+    ("Algorithms", "Fundamentals"), ("Excel", "Tools"), ("Machine Learning", "Data"),
+    ("Django", "Web"), ("Node.js", "Web"), ("Linux", "Tools"), ("Docker", "DevOps"),
+    ("C", "Programming"), ("Pandas", "Data"), ("AWS", "Cloud"), ("Communication", "Soft Skills"),
+    ("Spring Boot", "Web"), ("PostgreSQL", "Databases"), ("MongoDB", "Databases"),
+    ("TypeScript", "Programming"), ("Kubernetes", "DevOps"), ("Power BI", "Data"),
+    ("Flutter", "Mobile"), ("Kotlin", "Mobile"), ("Go", "Programming"),
+]
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Ananya", "Arjun", "Diya", "Ishaan", "Kavya", "Meera", "Nikhil", "Priya",
+    "Rahul", "Riya", "Rohan", "Sanya", "Siddharth", "Sneha", "Tanvi", "Varun", "Vihaan", "Zoya",
+]
+LAST_NAMES = [
+    "Agarwal", "Bansal", "Chouhan", "Deshmukh", "Gupta", "Iyer", "Jain", "Joshi", "Khan", "Mehta",
+    "Nair", "Patel", "Rao", "Reddy", "Sharma", "Shah", "Singh", "Tiwari", "Verma", "Yadav",
+]
+JOB_TITLES = [
+    "Software Engineer", "Data Analyst", "Backend Developer", "Frontend Developer", "QA Engineer",
+    "DevOps Engineer", "Data Scientist", "Full Stack Developer", "Mobile Developer", "Business Analyst",
+]
+COMPANIES = [
+    "Infosys", "TCS", "Wipro", "Accenture", "Capgemini", "Cognizant", "HCLTech", "Tech Mahindra",
+    "Persistent", "Zoho", "Freshworks", "Razorpay", "Flipkart", "Swiggy", "Paytm", "Deloitte",
+]
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """Let bulk_create keep the given ``auto_now_add`` values instead of stamping now."""
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed large, deterministic synthetic data for benchmarking: students with "
+        "profiles, TPOs, skills, student skills, job postings with required skills "
+        "and roadmaps. Skill popularity follows a Zipf distribution. Use a throwaway "
+        "database (DATABASE_URL); the command refuses to run twice on one database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=10000)
+        parser.add_argument("--tpos", type=int, default=50)
+        parser.add_argument("--jobs", type=int, default=1000)
+        parser.add_argument("--skills", type=int, default=500, help="Distinct skills (at least 30 are named).")
+        parser.add_argument("--skills-per-student", type=float, default=5.0, help="Mean skills per student.")
+        parser.add_argument("--skills-per-job", type=float, default=4.0, help="Mean required skills per job.")
+        parser.add_argument("--roadmaps-per-student", type=float, default=1.0, help="Mean roadmaps per student.")
+        parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for skill popularity.")
+        parser.add_argument("--days", type=int, default=365, help="Spread timestamps over this many days.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--password", default="pass12345", help="Password of every seeded user.")
+
+    def handle(self, *args, **options):
+        if CustomUser.objects.filter(username__startswith=USERNAME_PREFIX).exists():
+            raise CommandError("Benchmark data is already present; seed a fresh database instead.")
+        self.options = options
+        self.rng = random.Random(options["seed"])
+        self.now = timezone.now()
+        started = time.perf_counter()
+
+        skill_ids = self.seed_skills()
+        # Cumulative Zipf weights by popularity rank.
+        self.skill_ids = skill_ids
+        self.cum_weights = list(accumulate(1 / rank ** options["zipf"] for rank in range(1, len(skill_ids) + 1)))
+
+        password = make_password(options["password"])
+        student_ids = self.insert(CustomUser, (
+            CustomUser(
+                username=f"{USERNAME_PREFIX}student{index}",
+                email=f"{USERNAME_PREFIX}student{index}@example.com",
+                password=password,
+            )
+            for index in range(options["students"])
+        ))
+        tpo_ids = self.insert(CustomUser, (
+            CustomUser(
+                username=f"{USERNAME_PREFIX}tpo{index}",
+                email=f"{USERNAME_PREFIX}tpo{index}@example.com",
+                password=password,
+                is_tpo=True,
+            )
+            for index in range(options["tpos"])
+        ))
+        profile_ids = self.insert(StudentProfile, (
+            StudentProfile(
+                user_id=user_id,
+                full_name=f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
+                phone=f"9{self.rng.randrange(10 ** 9):09d}",
+                cgpa=round(min(10.0, max(4.0, self.rng.gauss(7.4, 1.1))), 2),
+                career_goal=f"Become a {self.rng.choice(JOB_TITLES)}",
+            )
+            for user_id in student_ids
+        ))
+        self.insert(StudentSkillSet, (
+            StudentSkillSet(student_profile_id=profile_id, skill_id=skill_id, skill_level=self.rng.randint(1, 5))
+            for profile_id in profile_ids
+            for skill_id in self.sample_skills(options["skills_per_student"])
+        ), return_ids=False)
+        # bulk_create skips the signals that keep skill_count current.
+        services.refresh_skill_counts(StudentProfile.objects.all())
+
+        if tpo_ids:
+            with explicit_timestamps(JobPosting._meta.get_field("posted_on")):
+                job_ids = self.insert(JobPosting, (
+                    JobPosting(
+                        tpo_user_id=self.rng.choice(tpo_ids),
+                        title=self.rng.choice(JOB_TITLES),
+                        company=self.rng.choice(COMPANIES),
+                        description="Work with the team to design, build and ship product features.",
+                        posted_on=self.random_timestamp(),
+                    )
+                    for _ in range(options["jobs"])
+                ))
+            self.insert(RequiredSkill, (
+                RequiredSkill(job_posting_id=job_id, skill_id=skill_id, required_level=self.rng.randint(2, 5))
+                for job_id in job_ids
+                for skill_id in self.sample_skills(options["skills_per_job"])
+            ), return_ids=False)
+        elif options["jobs"]:
+            self.stderr.write("No TPOs to own job postings; skipping jobs.")
+
+        with explicit_timestamps(Roadmap._meta.get_field("generated_on")):
+            self.insert(Roadmap, (
+                Roadmap(
+                    profile_id=profile_id,
+                    roadmap_text=f"Roadmap {step + 1}: strengthen fundamentals, build two projects, "
+                    "practise interviews.",
+                    generated_on=self.random_timestamp(),
+                )
+                for profile_id in profile_ids
+                for step in range(self.poisson_count(options["roadmaps_per_student"]))
+            ), return_ids=False)
+
+        response_cache.invalidate("skill", "jobposting", "user", "studentprofile")
+        me_cache.invalidate_all()
+        if options["verbosity"] >= 1:
+            self.stdout.write(self.style.SUCCESS(f"Seeded in {time.perf_counter() - started:.1f}s"))
+
+    def seed_skills(self):
+        count = max(self.options["skills"], len(KNOWN_SKILLS))
+        names = KNOWN_SKILLS + [(f"Skill {index:05d}", "Other") for index in range(len(KNOWN_SKILLS), count)]
+        self.insert(
+            Skill,
+            (Skill(skill_name=name, category=category) for name, category in names),
+            return_ids=False,
+            ignore_conflicts=True,
+        )
+        ids = dict(Skill.objects.filter(skill_name__in=[name for name, _ in names]).values_list("skill_name", "pk"))
+        return [ids[name] for name, _ in names]
+
+    def insert(self, model, objects, return_ids=True, **kwargs):
+        """
+        bulk_create ``objects`` in batches inside one transaction, without
+        holding them all in memory. Returns the new primary keys in insertion
+        order when ``return_ids`` is set.
+        """
+        batch_size = self.options["batch_size"]
+        started = time.perf_counter()
+        last_pk = model.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+        total = 0
+        with transaction.atomic():
+            while batch := list(islice(objects, batch_size)):
+                model.objects.bulk_create(batch, batch_size=batch_size, **kwargs)
+                total += len(batch)
+        elapsed = time.perf_counter() - started
+        if self.options["verbosity"] >= 1:
+            self.stdout.write(
+                f"{model.__name__:<16} {total:>10,} rows {elapsed:>7.1f}s "
+                f"{total / elapsed if elapsed else 0:>10,.0f} rows/s"
+            )
+        if not return_ids:
+            return None
+        return list(model.objects.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True))
+
+    def sample_skills(self, mean):
+        """Distinct skill ids drawn by popularity, about ``mean`` of them."""
+        wanted = min(len(self.skill_ids), max(1, round(self.rng.gauss(mean, mean / 3))))
+        chosen = set()
+        while len(chosen) < wanted:
+            chosen.update(self.rng.choices(self.skill_ids, cum_weights=self.cum_weights, k=wanted - len(chosen)))
+        return chosen
+
+    def poisson_count(self, mean):
+        # Knuth's method; means here are small.
+        limit, count, product = math.exp(-mean), 0, self.rng.random()
+        while product > limit:
+            count += 1
+            product *= self.rng.random()
+        return count
+
+    def random_timestamp(self):
+        return self.now - timedelta(seconds=self.rng.randrange(max(1, self.options["days"] * 86400)))
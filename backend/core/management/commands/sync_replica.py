@@ -0,0 +1,51 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from core.db_routers import REPLICA_ALIAS
+from core.models import ReplicaHeartbeat
+
+
+class Command(BaseCommand):
+    help = (
+        "Stamp the replication heartbeat on the primary. With SQLite on both "
+        "aliases, also copy the primary into the replica file, which stands in "
+        "for streaming replication when trying the replica setup locally."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Repeat every INTERVAL seconds instead of running once.",
+        )
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in settings.DATABASES:
+            raise CommandError("No replica configured; set DATABASE_REPLICA_URL.")
+        copy = all(connections[alias].vendor == "sqlite" for alias in (DEFAULT_DB_ALIAS, REPLICA_ALIAS))
+
+        while True:
+            ReplicaHeartbeat.objects.using(DEFAULT_DB_ALIAS).update_or_create(
+                pk=1, defaults={"beat": timezone.now()}
+            )
+            if copy:
+                self.copy_sqlite()
+            self.stdout.write(f"{timezone.now():%H:%M:%S} heartbeat{' and copy' if copy else ''} done")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    def copy_sqlite(self):
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        replica = sqlite3.connect(settings.DATABASES[REPLICA_ALIAS]["NAME"])
+        try:
+            primary.connection.backup(replica)
+        finally:
+            replica.close()
@@ -0,0 +1,355 @@
+"""
+Request metrics: per-route latency histograms plus a breakdown of database,
+serialization and LLM time, exposed in the Prometheus text format.
+
+Each process keeps its samples in memory. When ``METRICS_MULTIPROC_DIR`` is
+set (for example to the same directory for every gunicorn worker) the
+samples are periodically written to one JSON file per process and the
+metrics endpoint merges all files, so a scrape sees the whole server.
+"""
+
+import atexit
+import contextvars
+import ipaddress
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+from . import tracing
+
+
+def scraper_allowed(address):
+    """
+    Whether ``address`` may read the metrics: it is listed in, or falls in
+    a network (CIDR) listed in, ``METRICS_ALLOWED_IPS``.
+    """
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    for allowed in settings.METRICS_ALLOWED_IPS:
+        try:
+            if address in ipaddress.ip_network(allowed.strip(), strict=False):
+                return True
+        except ValueError:
+            continue
+    return False
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# name -> (type, help text)
+METRICS = {
+    "acroconnect_http_requests_total": ("counter", "HTTP requests by route, method and status."),
+    "acroconnect_http_request_duration_seconds": ("histogram", "End-to-end request latency."),
+    "acroconnect_db_queries_total": ("counter", "Database queries executed while serving requests."),
+    "acroconnect_db_duration_seconds": ("histogram", "Time spent in database queries per request."),
+    "acroconnect_serialize_duration_seconds": ("histogram", "Time spent in serializers per request."),
+    "acroconnect_llm_duration_seconds": ("histogram", "Time spent waiting on LLM calls per request."),
+    "acroconnect_llm_requests_total": ("counter", "LLM calls by model and outcome."),
+    "acroconnect_db_replica_lag_seconds": ("gauge", "Age of the newest primary heartbeat seen on the replica."),
+}
+
+
+class RequestStats:
+    """
+    Per-request accumulator for the time spent in each phase.
+    """
+
+    __slots__ = ("db_queries", "db_seconds", "serialize_seconds", "llm_seconds", "serialize_depth")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.llm_seconds = 0.0
+        self.serialize_depth = 0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook counting and timing queries."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_seconds += time.perf_counter() - start
+
+
+_current_stats = contextvars.ContextVar("acroconnect_request_stats", default=None)
+
+
+def current_stats():
+    return _current_stats.get()
+
+
+def db_wrapper(execute, sql, params, many, context):
+    """
+    ``connection.execute_wrapper`` hook installed on every connection (see
+    ``core/db.py``); attributes queries to the request being served. The
+    request's stats live in a context variable, which also reaches the
+    threads the async ORM runs queries in.
+    """
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats.db_wrapper(execute, sql, params, many, context)
+
+
+@contextmanager
+def collect_request_stats():
+    stats = RequestStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def serializer_timer(name="serializer"):
+    """
+    Attribute time to serialization and trace each serializer. Nested
+    serializers run inside their parent's timer, so only the outermost call
+    is measured.
+    """
+    with tracing.span(f"serialize {name}"):
+        stats = _current_stats.get()
+        if stats is None or stats.serialize_depth:
+            if stats is not None:
+                stats.serialize_depth += 1
+            try:
+                yield
+            finally:
+                if stats is not None:
+                    stats.serialize_depth -= 1
+            return
+
+        stats.serialize_depth = 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.serialize_seconds += time.perf_counter() - start
+            stats.serialize_depth = 0
+
+
+@contextmanager
+def llm_timer(model_name):
+    """
+    Time and trace a single LLM call and count it by model and outcome.
+    """
+    stats = _current_stats.get()
+    start = time.perf_counter()
+    outcome = "error"
+    with tracing.span("llm.generate", **{"llm.model": model_name}) as span:
+        try:
+            yield
+            outcome = "success"
+        finally:
+            if stats is not None:
+                stats.llm_seconds += time.perf_counter() - start
+            if span is not None:
+                span.set("llm.outcome", outcome)
+            registry.inc("acroconnect_llm_requests_total", {"model": model_name, "outcome": outcome})
+
+
+class MetricsRegistry:
+    """
+    Thread-safe in-process store of counters and histograms.
+    """
+
+    def __init__(self, directory=None, flush_interval=1.0):
+        self._lock = threading.Lock()
+        self._directory = directory
+        self._flush_interval = flush_interval
+        self._configured = directory is not None
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._started = time.time_ns()
+        self._last_flush = 0.0
+        self._counters = {}
+        self._histograms = {}
+
+    def _configure(self):
+        if not self._configured:
+            self._directory = getattr(settings, "METRICS_MULTIPROC_DIR", None)
+            self._flush_interval = getattr(settings, "METRICS_FLUSH_INTERVAL", self._flush_interval)
+            self._configured = True
+        if self._pid != os.getpid():
+            # Forked worker: samples recorded by the parent belong to the parent.
+            self._reset()
+
+    @staticmethod
+    def _key(name, labels):
+        return (name, tuple(sorted(labels.items())))
+
+    def inc(self, name, labels, value=1):
+        key = self._key(name, labels)
+        with self._lock:
+            self._configure()
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value, buckets=LATENCY_BUCKETS):
+        key = self._key(name, labels)
+        with self._lock:
+            self._configure()
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    "buckets": list(buckets),
+                    "counts": [0] * len(buckets),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            for index, bound in enumerate(histogram["buckets"]):
+                if value <= bound:
+                    histogram["counts"][index] += 1
+                    break
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def record_request(self, method, route, status, duration, stats):
+        labels = {"route": route, "method": method}
+        self.inc("acroconnect_http_requests_total", {**labels, "status": str(status)})
+        self.observe("acroconnect_http_request_duration_seconds", labels, duration)
+        self.inc("acroconnect_db_queries_total", labels, stats.db_queries)
+        self.observe("acroconnect_db_duration_seconds", labels, stats.db_seconds)
+        self.observe("acroconnect_serialize_duration_seconds", labels, stats.serialize_seconds)
+        if stats.llm_seconds:
+            self.observe("acroconnect_llm_duration_seconds", labels, stats.llm_seconds)
+        self.maybe_flush()
+
+    def snapshot(self):
+        with self._lock:
+            self._configure()
+            return {
+                "counters": [[name, dict(labels), value] for (name, labels), value in self._counters.items()],
+                "histograms": [
+                    [name, dict(labels), {**histogram, "counts": list(histogram["counts"])}]
+                    for (name, labels), histogram in self._histograms.items()
+                ],
+            }
+
+    def _path(self):
+        return Path(self._directory) / f"metrics-{self._pid}-{self._started}.json"
+
+    def maybe_flush(self):
+        if self._directory and time.monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Atomically write this process's samples to the shared directory."""
+        if not self._directory:
+            return
+        snapshot = self.snapshot()
+        directory = Path(self._directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+        with os.fdopen(fd, "w") as handle:
+            json.dump(snapshot, handle)
+        os.replace(tmp_path, self._path())
+        self._last_flush = time.monotonic()
+
+    def collect(self):
+        """
+        Return samples merged across every process sharing the directory
+        (or just this process when no directory is configured).
+        """
+        self._configure()
+        if not self._directory:
+            return [self.snapshot()]
+
+        self.flush()
+        snapshots = []
+        for path in sorted(Path(self._directory).glob("metrics-*.json")):
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                # A worker may be replacing its file right now; skip it this scrape.
+                continue
+        return snapshots
+
+
+def merge(snapshots):
+    counters = {}
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            key = MetricsRegistry._key(name, labels)
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, histogram in snapshot["histograms"]:
+            key = MetricsRegistry._key(name, labels)
+            merged = histograms.get(key)
+            if merged is None or merged["buckets"] != histogram["buckets"]:
+                histograms[key] = {**histogram, "counts": list(histogram["counts"])}
+                continue
+            merged["counts"] = [a + b for a, b in zip(merged["counts"], histogram["counts"])]
+            merged["sum"] += histogram["sum"]
+            merged["count"] += histogram["count"]
+    return counters, histograms
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(snapshots, gauges=()):
+    """
+    Render merged snapshots in the Prometheus text exposition format.
+    ``gauges`` are ``(name, labels, value)`` samples measured at scrape time.
+    """
+    counters, histograms = merge(snapshots)
+    lines = []
+    for name, (metric_type, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        if metric_type == "gauge":
+            for gauge_name, labels, value in gauges:
+                if gauge_name == name:
+                    lines.append(f"{name}{_format_labels(sorted(labels.items()))} {_format_value(value)}")
+            continue
+        if metric_type == "counter":
+            for (key_name, labels), value in sorted(counters.items()):
+                if key_name == name:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            continue
+
+        for (key_name, labels), histogram in sorted(histograms.items()):
+            if key_name != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(histogram["buckets"], histogram["counts"]):
+                cumulative += count
+                bucket_labels = labels + (("le", _format_value(float(bound))),)
+                lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            inf_labels = labels + (("le", "+Inf"),)
+            lines.append(f"{name}_bucket{_format_labels(inf_labels)} {histogram['count']}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Make sure the last samples of an exiting worker reach the shared directory.
+atexit.register(registry.flush)
@@ -0,0 +1,148 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from . import db_routers, metrics, profiling, tracing
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, database, serialization and LLM time for every request,
+    labelled with the matched URL name. Works under both WSGI and ASGI;
+    queries are counted by the hook ``core/db.py`` installs on every
+    connection.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with metrics.collect_request_stats() as stats:
+            response = self.get_response(request)
+        self.record(request, response, start, stats)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with metrics.collect_request_stats() as stats:
+            response = await self.get_response(request)
+        self.record(request, response, start, stats)
+        return response
+
+    def record(self, request, response, start, stats):
+        # Router URLs are regexes, so label by URL name rather than pattern.
+        match = getattr(request, "resolver_match", None)
+        route = (match.view_name or match.route) if match is not None else "<unmatched>"
+        metrics.registry.record_request(
+            request.method, route, response.status_code, time.perf_counter() - start, stats
+        )
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Routes the ORM reads of safe requests to the read replica; see
+    ``core/db_routers.py``. Only installed when a replica is configured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        claims = db_routers.token_claims(request)
+        token = db_routers.begin_request(request, claims)
+        response = None
+        try:
+            response = self.get_response(request)
+        finally:
+            db_routers.end_request(token, request, claims, response)
+        return response
+
+    async def __acall__(self, request):
+        claims = db_routers.token_claims(request)
+        token = db_routers.begin_request(request, claims)
+        response = None
+        try:
+            response = await self.get_response(request)
+        finally:
+            db_routers.end_request(token, request, claims, response)
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profiles single requests on demand for staff users; see
+    ``core/profiling.py``. Async requests pass through unprofiled.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.get_response(request)
+        mode = profiling.requested_mode(request)
+        if mode is not None:
+            user = profiling.staff_user(request)
+            if user is not None:
+                return profiling.profile_request(request, self.get_response, mode, user)
+        return self.get_response(request)
+
+
+class TracingMiddleware:
+    """
+    Opens the root span of sampled requests; see ``core/tracing.py``. The
+    span is named after the matched URL and sampled responses carry their
+    trace id in ``X-Trace-Id``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with tracing.trace_request(request) as span:
+            response = self.get_response(request)
+            if span is not None:
+                self.finish(request, response, span)
+        return response
+
+    async def __acall__(self, request):
+        with tracing.trace_request(request) as span:
+            response = await self.get_response(request)
+            if span is not None:
+                self.finish(request, response, span)
+        return response
+
+    def finish(self, request, response, span):
+        match = getattr(request, "resolver_match", None)
+        if match is not None:
+            span.name = f"{request.method} {match.view_name or match.route}"
+            span.set("http.route", match.route)
+        span.set("http.status_code", response.status_code)
+        response["X-Trace-Id"] = span.trace.trace_id
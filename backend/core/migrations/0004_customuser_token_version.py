@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_customuser_email_lower_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, help_text="Incremented to revoke issued tokens when the user's role changes."),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_missing_profiles(apps, schema_editor):
+    """
+    GET /student-profiles/me/ no longer creates profiles on the fly, so make
+    sure every existing student account has one.
+    """
+    CustomUser = apps.get_model("core", "CustomUser")
+    StudentProfile = apps.get_model("core", "StudentProfile")
+
+    students = CustomUser.objects.filter(is_tpo=False, student_profile__isnull=True)
+    StudentProfile.objects.bulk_create(
+        StudentProfile(
+            user=user,
+            full_name=f"{user.first_name} {user.last_name}".strip() or user.username,
+            phone="",
+            cgpa=0.0,
+        )
+        for user in students.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_customuser_token_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_profiles, migrations.RunPython.noop),
+    ]
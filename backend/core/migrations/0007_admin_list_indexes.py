@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:42
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0006_replicaheartbeat'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='core_user_username_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['-posted_on'], name='core_job_posted_on_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='core_job_title_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(django.db.models.functions.text.Lower('company'), name='core_job_company_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roadmap',
+            index=models.Index(fields=['-generated_on'], name='core_roadmap_generated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(fields=['full_name'], name='core_profile_full_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(django.db.models.functions.text.Lower('full_name'), name='core_profile_name_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:21
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_skill_counts(apps, schema_editor):
+    StudentProfile = apps.get_model("core", "StudentProfile")
+    StudentSkillSet = apps.get_model("core", "StudentSkillSet")
+
+    counts = (
+        StudentSkillSet.objects.filter(student_profile=OuterRef("pk"))
+        .order_by()
+        .values("student_profile")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    StudentProfile.objects.update(skill_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_admin_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='skill_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_skill_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(fields=['cgpa'], name='core_profile_cgpa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(fields=['skill_count'], name='core_profile_skill_count_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class CustomUser(AbstractUser):
@@ -8,15 +9,47 @@ class CustomUser(AbstractUser):
     Application-specific user model that distinguishes TPO users from students.
     """
 
+    # Fields whose change invalidates previously issued access tokens.
+    TOKEN_CLAIM_FIELDS = ("is_tpo", "is_staff", "is_active")
+
     email = models.EmailField(unique=True)
     is_tpo = models.BooleanField(default=False)
+    token_version = models.PositiveIntegerField(
+        default=0, help_text="Incremented to revoke issued tokens when the user's role changes."
+    )
 
     REQUIRED_FIELDS = ["email"]
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Serves case-insensitive email lookups at login.
+            models.Index(Lower("email"), name="core_user_email_lower_idx"),
+            # Prefix search in the admin (see core/admin.py).
+            models.Index(Lower("username"), name="core_user_username_lower_idx"),
+        ]
+
     def __str__(self) -> str:
         role = "TPO" if self.is_tpo else "Student"
         return f"{self.username} ({role})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_claims = {
+            name: getattr(instance, name) for name in cls.TOKEN_CLAIM_FIELDS if name in field_names
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, "_loaded_claims", None)
+        if loaded and any(getattr(self, name) != value for name, value in loaded.items()):
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+        self._loaded_claims = {name: getattr(self, name) for name in self.TOKEN_CLAIM_FIELDS}
+
 
 class Skill(models.Model):
     """
@@ -49,9 +82,18 @@ class StudentProfile(models.Model):
     skills = models.ManyToManyField(
         Skill, through="StudentSkillSet", related_name="student_profiles", blank=True
     )
+    # Number of StudentSkillSet rows, kept up to date by signals.py so the
+    # TPO student table can sort on an index instead of counting per request.
+    skill_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["full_name"]
+        indexes = [
+            models.Index(fields=["full_name"], name="core_profile_full_name_idx"),
+            models.Index(Lower("full_name"), name="core_profile_name_lower_idx"),
+            models.Index(fields=["cgpa"], name="core_profile_cgpa_idx"),
+            models.Index(fields=["skill_count"], name="core_profile_skill_count_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.full_name
@@ -75,6 +117,11 @@ class JobPosting(models.Model):
 
     class Meta:
         ordering = ["-posted_on"]
+        indexes = [
+            models.Index(fields=["-posted_on"], name="core_job_posted_on_idx"),
+            models.Index(Lower("title"), name="core_job_title_lower_idx"),
+            models.Index(Lower("company"), name="core_job_company_lower_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -133,6 +180,21 @@ class Roadmap(models.Model):
 
     class Meta:
         ordering = ["-generated_on"]
+        indexes = [
+            models.Index(fields=["-generated_on"], name="core_roadmap_generated_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Roadmap for {self.profile.full_name} on {self.generated_on:%Y-%m-%d}"
+
+
+class ReplicaHeartbeat(models.Model):
+    """
+    Single row the ``sync_replica`` command stamps on the primary; its age on
+    the replica is the replication lag reported by ``/metrics/``.
+    """
+
+    beat = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"Heartbeat at {self.beat:%Y-%m-%d %H:%M:%S}"
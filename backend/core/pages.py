@@ -0,0 +1,106 @@
+"""
+Payloads of the page bootstrap endpoints (``/api/v1/pages/``).
+
+Each function returns everything one Streamlit page renders, so a cold page
+load is a single request instead of one per resource. The parts reuse the
+``/me`` caches and the ``values()`` list builders, so each part has the same
+shape as the endpoint it replaces, except that lists already scoped to the
+caller leave out the copies of the caller's profile.
+"""
+
+from django.db.models import Count, Sum
+from django.http import Http404
+
+from . import cache as me_cache
+from . import fast_serializers
+from . import response_cache
+from .models import CustomUser, Roadmap, Skill, StudentProfile, StudentSkillSet
+from .serializers import CustomUserSerializer
+
+
+def user_payload(user):
+    # Built from the row, not the request user: a ClaimsUser answers email
+    # from its token, which an email change does not revoke.
+    return me_cache.get_user_payload(
+        user.pk, lambda: CustomUserSerializer(CustomUser.objects.get(pk=user.pk)).data
+    )
+
+
+def profile_id_for(user):
+    profile_id = getattr(user, "profile_id", None)
+    if profile_id is None:
+        profile_id = StudentProfile.objects.filter(user_id=user.pk).values_list("pk", flat=True).first()
+    if profile_id is None:
+        raise Http404("No student profile for this user.")
+    return profile_id
+
+
+def profile_payload(profile_id):
+    def build():
+        profiles = fast_serializers.student_profiles(StudentProfile.objects.filter(pk=profile_id))
+        if not profiles:
+            raise Http404("No student profile for this user.")
+        return profiles[0]
+
+    return me_cache.get_profile_payload(profile_id, build)
+
+
+def skill_catalog():
+    return list(Skill.objects.values("id", "skill_name", "category"))
+
+
+def student_home(user):
+    """
+    The profile and roadmap pages: ``user`` and ``profile`` as returned by
+    the ``/me`` endpoints, the skill catalog as ``/skills/``, and the
+    student's own roadmaps without the embedded profile.
+    """
+    profile_id = profile_id_for(user)
+    roadmaps = Roadmap.objects.filter(profile_id=profile_id).values("id", "roadmap_text", "generated_on")
+    return {
+        "user": user_payload(user),
+        "profile": profile_payload(profile_id),
+        "skills": skill_catalog(),
+        "roadmaps": [
+            {**roadmap, "generated_on": fast_serializers.format_datetime(roadmap["generated_on"])}
+            for roadmap in roadmaps
+        ],
+    }
+
+
+def student_analytics():
+    """
+    Student count, average skills per student and students per skill,
+    aggregated in the database and kept in the response cache until a
+    profile, skill assignment or skill changes.
+    """
+
+    def build():
+        totals = StudentProfile.objects.aggregate(students=Count("pk"), skills=Sum("skill_count"))
+        distribution = (
+            StudentSkillSet.objects.values("skill__skill_name")
+            .annotate(count=Count("pk"))
+            .order_by("-count", "skill__skill_name")
+        )
+        total_students = totals["students"]
+        return {
+            "total_students": total_students,
+            "average_skills": round(totals["skills"] / total_students, 2) if total_students else 0,
+            "skill_distribution": [
+                {"skill_name": row["skill__skill_name"], "count": row["count"]} for row in distribution
+            ],
+        }
+
+    return response_cache.get_or_build(["student-analytics"], ["studentprofile", "skill"], build)
+
+
+def tpo_dashboard(user):
+    """
+    The TPO dashboard's analytics and the skill catalog for the student
+    table's filter. The table itself is paged by ``StudentTableView``.
+    """
+    return {
+        "user": user_payload(user),
+        "skills": skill_catalog(),
+        **student_analytics(),
+    }
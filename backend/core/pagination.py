@@ -0,0 +1,19 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class OptInPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination that only applies when the client sends
+    ``?page_size=``; without it the list stays a plain, complete array, so
+    existing clients keep working.
+    """
+
+    page_size = None
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class StudentTablePagination(PageNumberPagination):
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
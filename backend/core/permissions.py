@@ -0,0 +1,10 @@
+from rest_framework import permissions
+
+
+class IsTPO(permissions.BasePermission):
+    """Allows access only to authenticated TPO users."""
+
+    message = "Only TPO users can access this page."
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and request.user.is_tpo)
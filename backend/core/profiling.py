@@ -0,0 +1,197 @@
+"""
+On-demand profiling of single requests for staff users.
+
+A staff user (admin session or a JWT with the ``is_staff`` claim) adds
+``X-Profile: 1`` or ``?profile=1`` to a request and ``ProfilingMiddleware``
+runs that request under ``cProfile``; ``X-Profile: sampling`` (or
+``?profile=sampling``) uses pyinstrument's sampling profiler when it is
+installed. The profile and the SQL the request executed are written to
+``PROFILE_DIR``, which keeps the newest ``PROFILE_KEEP`` captures, and are
+browsable under ``/admin/profiles/``. The response carries the capture name
+in ``X-Profile-Id``.
+
+Requests without the flag pay for one header and one query-string check.
+Only sync requests are profiled: the async views share their thread with
+every other request on the event loop.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import re
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.exceptions import APIException
+
+from .authentication import ClaimsJWTAuthentication
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+logger = logging.getLogger(__name__)
+
+HEADER = "HTTP_X_PROFILE"
+QUERY_FLAG = "profile="
+NAME_RE = re.compile(r"^[\w.-]+$")
+MAX_PARAMS_LENGTH = 500
+
+
+def requested_mode(request):
+    """``"cprofile"``, ``"sampling"`` or ``None`` when the request asks for no profile."""
+    flag = request.META.get(HEADER)
+    if flag is None:
+        if QUERY_FLAG not in request.META.get("QUERY_STRING", ""):
+            return None
+        flag = request.GET.get("profile")
+    if not flag or flag == "0":
+        return None
+    return "sampling" if flag == "sampling" else "cprofile"
+
+
+def staff_user(request):
+    """The staff user behind the session or bearer token, else ``None``."""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return user
+    try:
+        result = ClaimsJWTAuthentication().authenticate(request)
+    except APIException:
+        return None
+    if result is None or not result[0].is_staff:
+        return None
+    return result[0]
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                "database": context["connection"].alias,
+                "sql": sql,
+                "params": repr(params)[:MAX_PARAMS_LENGTH],
+                "ms": round((time.perf_counter() - start) * 1000, 3),
+            })
+
+
+def profile_request(request, get_response, mode, user):
+    """Run ``get_response(request)`` under a profiler and save the capture."""
+    if mode == "sampling" and pyinstrument is None:
+        mode = "cprofile"
+    if mode == "sampling":
+        profiler = pyinstrument.Profiler()
+        start_profiler, stop_profiler = profiler.start, profiler.stop
+    else:
+        profiler = cProfile.Profile()
+        start_profiler, stop_profiler = profiler.enable, profiler.disable
+    recorder = QueryRecorder()
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        start_profiler()
+        try:
+            response = get_response(request)
+        finally:
+            stop_profiler()
+    elapsed = time.perf_counter() - start
+
+    try:
+        name = save_capture(request, response, mode, user, profiler, recorder.queries, elapsed)
+    except OSError:
+        logger.exception("Could not save the profile of %s %s", request.method, request.path)
+        return response
+    response["X-Profile-Id"] = name
+    return response
+
+
+def profile_dir():
+    path = Path(settings.PROFILE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def save_capture(request, response, mode, user, profiler, queries, elapsed):
+    now = datetime.now(timezone.utc)
+    slug = re.sub(r"[^\w]+", "-", request.path).strip("-")[:60] or "root"
+    name = f"{now:%Y%m%dT%H%M%S%f}-{request.method.lower()}-{slug}"
+    directory = profile_dir()
+    if mode == "sampling":
+        profile_file = f"{name}.html"
+        (directory / profile_file).write_text(profiler.output_html())
+    else:
+        profile_file = f"{name}.prof"
+        profiler.dump_stats(directory / profile_file)
+    metadata = {
+        "name": name,
+        "created": now.isoformat(timespec="seconds"),
+        "method": request.method,
+        "path": request.get_full_path(),
+        "status": response.status_code,
+        "user": user.pk,
+        "mode": mode,
+        "duration_ms": round(elapsed * 1000, 3),
+        "query_count": len(queries),
+        "query_ms": round(sum(query["ms"] for query in queries), 3),
+        "profile_file": profile_file,
+        "queries": queries,
+    }
+    (directory / f"{name}.json").write_text(json.dumps(metadata, indent=1))
+    rotate(directory)
+    return name
+
+
+def rotate(directory):
+    captures = sorted(directory.glob("*.json"))
+    for stale in captures[: max(0, len(captures) - settings.PROFILE_KEEP)]:
+        for path in directory.glob(f"{stale.stem}.*"):
+            path.unlink(missing_ok=True)
+
+
+def list_captures():
+    """Metadata of every capture, newest first, without the queries."""
+    captures = []
+    for path in sorted(profile_dir().glob("*.json"), reverse=True):
+        try:
+            metadata = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        metadata.pop("queries", None)
+        captures.append(metadata)
+    return captures
+
+
+def load_capture(name):
+    """Metadata of capture ``name``, or ``None`` if there is no such capture."""
+    if not NAME_RE.match(name):
+        return None
+    try:
+        return json.loads((profile_dir() / f"{name}.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def profile_path(capture):
+    return profile_dir() / capture["profile_file"]
+
+
+def stats_text(capture, limit=60):
+    """The top of a cProfile capture's stats sorted by cumulative time."""
+    stream = io.StringIO()
+    stats = pstats.Stats(str(profile_path(capture)), stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return stream.getvalue()
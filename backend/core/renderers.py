@@ -0,0 +1,122 @@
+"""
+Fast renderers and parsers for the REST API.
+
+``FastJSONRenderer`` produces the same bytes as DRF's ``JSONRenderer`` for
+compact responses but encodes with ``orjson`` when it is installed.
+``MessagePackRenderer`` / ``MessagePackParser`` add an ``application/msgpack``
+representation that clients can opt into through the ``Accept`` and
+``Content-Type`` headers.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.utils import encoders
+
+# Both encoders are optional: without orjson we fall back to DRF's stdlib
+# based implementation, without msgpack the msgpack media type is unusable.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+_fallback_encoder = encoders.JSONEncoder()
+
+if orjson is not None:
+    # Datetimes are handed to DRF's encoder so the format stays identical
+    # to the stock renderer ("Z" suffix for UTC).
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    ORJSON_ERRORS = (TypeError, orjson.JSONEncodeError)
+
+
+def _default(obj):
+    """
+    Encode values the fast encoders do not understand natively
+    (Decimal, lazy translation strings, querysets, ...).
+    """
+    return _fallback_encoder.default(obj)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    Drop-in replacement for ``JSONRenderer`` backed by ``orjson``.
+
+    Indented output (requested through ``Accept: application/json; indent=4``
+    or the browsable API) and anything orjson refuses to encode go through
+    the stock renderer, so the wire format never changes.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except ORJSON_ERRORS:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Match JSONRenderer, which escapes these for JavaScript compatibility.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """
+    Parses JSON request bodies with ``orjson`` when it is available.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """
+    Renders responses as MessagePack for clients sending
+    ``Accept: application/msgpack``.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if msgpack is None:
+            raise ImproperlyConfigured("MessagePackRenderer requires the 'msgpack' package.")
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses ``application/msgpack`` request bodies.
+    """
+
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if msgpack is None:
+            raise ParseError("MessagePack support is not installed on the server.")
+
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
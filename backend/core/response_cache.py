@@ -0,0 +1,234 @@
+"""
+Cache of fully rendered API responses for read-mostly viewsets.
+
+``CachedResponseMixin`` stores the rendered bytes of ``list``/``retrieve``
+responses, together with gzip and (when the ``brotli`` package is installed)
+brotli variants, in the ``responses`` cache alias. A hit is a cache lookup
+plus writing the stored bytes; serializers and renderers do not run.
+
+Entries are keyed by invalidation tags (e.g. ``"skill"`` for the whole skill
+list, ``"skill:3"`` for one skill). Each tag has a version stored next to the
+entries; the model signals in ``signals.py`` bump the versions of the tags a
+write affects, which retires exactly the entries built from that data.
+"""
+
+import gzip
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_header_parameters
+
+from .db_routers import primary
+
+# Optional: brotli variants are only produced when the package is available.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+RESPONSE_CACHE_ALIAS = "responses"
+
+
+def get_cache():
+    return caches[RESPONSE_CACHE_ALIAS]
+
+
+def _tag_key(tag):
+    return f"tag:{tag}"
+
+
+def tag_versions(tags):
+    """
+    Return the current version of each tag, creating missing ones.
+
+    Versions are timestamps rather than counters so a tag that was evicted
+    can never come back with a version an old entry was stored under.
+    """
+    cache = get_cache()
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+async def atag_versions(tags):
+    cache = get_cache()
+    keys = [_tag_key(tag) for tag in tags]
+    versions = await cache.aget_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        await cache.aset_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def make_key(parts, versions):
+    return ":".join([*map(str, parts), ".".join(map(str, versions))])
+
+
+def format_key(renderer, media_type):
+    """
+    The representation part of a key: the renderer's format plus the
+    ``indent`` of ``Accept: application/json; indent=4``, which changes the
+    rendered bytes.
+    """
+    indent = parse_header_parameters(media_type or "")[1].get("indent")
+    return f"{renderer.format}~{indent}" if indent else renderer.format
+
+
+def query_key(request):
+    return "&".join(f"{key}={value}" for key, value in sorted(request.GET.lists()))
+
+
+def get_or_build(parts, tags, build):
+    """
+    Return data cached under ``parts`` and the versions of ``tags``, calling
+    ``build()`` on the primary on a miss. For payloads that make up part of
+    a response rather than a whole one.
+    """
+    cache = get_cache()
+    key = make_key(["data", *parts], tag_versions(tags))
+    data = cache.get(key)
+    if data is None:
+        with primary():
+            data = build()
+        cache.set(key, data, settings.RESPONSE_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate(*tags):
+    """
+    Retire every cached response that depends on any of ``tags`` once the
+    current transaction commits (at once outside a transaction). Bumping
+    earlier would let a concurrent request cache the pre-commit data under
+    the new versions.
+    """
+    transaction.on_commit(lambda: get_cache().set_many({_tag_key(tag): time.time_ns() for tag in tags}, None))
+
+
+def build_entry(response):
+    body = bytes(response.content)
+    entry = {
+        "status": response.status_code,
+        "content_type": response["Content-Type"],
+        "identity": body,
+        "gzip": None,
+        "br": None,
+    }
+    if len(body) >= settings.RESPONSE_CACHE_MIN_COMPRESS_SIZE:
+        entry["gzip"] = gzip.compress(body, compresslevel=6, mtime=0)
+        if brotli is not None:
+            entry["br"] = brotli.compress(body, quality=5)
+    return entry
+
+
+def accepted_encodings(header):
+    """Map each coding in an ``Accept-Encoding`` header to its q-value."""
+    accepted = {}
+    for item in header.split(","):
+        coding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip():
+            accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+def choose_encoding(header, available):
+    """
+    The coding of ``available`` (in order of preference) with the highest
+    q-value in ``header``; codings with q=0 are refused. ``None`` means
+    the identity body.
+    """
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get("*", 0.0)
+    qualities = {coding: accepted.get(coding, wildcard) for coding in available}
+    candidates = [coding for coding in available if qualities[coding] > 0]
+    return max(candidates, key=qualities.get, default=None)
+
+
+def respond(request, entry, hit):
+    encoding = choose_encoding(
+        request.META.get("HTTP_ACCEPT_ENCODING", ""),
+        [name for name in ("br", "gzip") if entry[name] is not None],
+    )
+    response = HttpResponse(
+        entry[encoding] if encoding else entry["identity"],
+        status=entry["status"],
+        content_type=entry["content_type"],
+    )
+    if encoding:
+        response["Content-Encoding"] = encoding
+    response["X-Response-Cache"] = "hit" if hit else "miss"
+    patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+    return response
+
+
+class CachedResponseMixin:
+    """
+    Serve ``list`` and ``retrieve`` from the response cache.
+
+    ``cache_tags`` maps each action to the tags its response depends on;
+    ``{pk}`` is replaced with the object's primary key. Only the formats in
+    ``cacheable_formats`` are cached (the browsable API is per user).
+    """
+
+    cache_tags = {}
+    cacheable_formats = ("json", "msgpack")
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_cache_key(self, request, pk, tags):
+        return make_key(
+            [
+                self.basename,
+                self.action,
+                pk,
+                format_key(request.accepted_renderer, request.accepted_media_type),
+                query_key(request),
+            ],
+            tag_versions(tags),
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if request.accepted_renderer.format not in self.cacheable_formats:
+            return handler(request, *args, **kwargs)
+
+        pk = self.kwargs.get(self.lookup_field, "")
+        tags = [tag.format(pk=pk) for tag in self.cache_tags.get(self.action, ())]
+        cache = get_cache()
+        key = self.get_cache_key(request, pk, tags)
+        entry = cache.get(key)
+        if entry is not None:
+            return respond(request, entry, hit=True)
+
+        # Entries outlive replica lag, so build them from the primary.
+        with primary():
+            response = handler(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+
+        response.accepted_renderer = request.accepted_renderer
+        response.accepted_media_type = request.accepted_media_type
+        response.renderer_context = self.get_renderer_context()
+        response.render()
+        entry = build_entry(response)
+        cache.set(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+        return respond(request, entry, hit=False)
@@ -1,6 +1,12 @@
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import update_last_login
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
 
+from . import metrics
+from .authentication import add_user_claims
+from .services import register_user
 from .models import (
     CustomUser,
     Skill,
@@ -12,7 +18,18 @@ from .models import (
 )
 
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class InstrumentedSerializerMixin:
+    """
+    Attributes time spent building representations to the request metrics
+    and traces each one.
+    """
+
+    def to_representation(self, instance):
+        with metrics.serializer_timer(type(self).__name__):
+            return super().to_representation(instance)
+
+
+class CustomUserSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True)
     name = serializers.CharField(write_only=True, required=False)
     phone = serializers.CharField(write_only=True, required=False)
@@ -36,36 +53,7 @@ class CustomUserSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "is_active"]
 
     def create(self, validated_data):
-        # Extract fields that don't belong to User model
-        name = validated_data.pop("name", None)
-        phone = validated_data.pop("phone", None)
-        cgpa = validated_data.pop("cgpa", 0.0)
-        password = validated_data.pop("password")
-        
-        # Set is_active to True for new users
-        validated_data["is_active"] = True
-        
-        # Create the user
-        user = CustomUser.objects.create(**validated_data)
-        
-        # Hash the password properly using set_password
-        user.set_password(password)
-        user.save()
-        
-        # Create or update StudentProfile if name and phone are provided
-        # A post_save signal also creates a StudentProfile on user creation,
-        # so use get_or_create/update to avoid UNIQUE constraint errors.
-        if name and phone:
-            StudentProfile.objects.update_or_create(
-                user=user,
-                defaults={
-                    "full_name": name,
-                    "phone": phone,
-                    "cgpa": cgpa,
-                },
-            )
-        
-        return user
+        return register_user(**validated_data)
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -74,9 +62,14 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     username_field = 'username'
 
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         """
-        Override validate to support both username and email login.
+        Authenticate through UsernameOrEmailBackend (one lookup, one password
+        hash) and issue the token pair.
         """
         username_or_email = attrs.get('username')
         password = attrs.get('password')
@@ -87,47 +80,36 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
                 code='authorization'
             )
 
-        # Try to find user by username first, then by email
-        try:
-            user = CustomUser.objects.get(username=username_or_email)
-        except CustomUser.DoesNotExist:
-            try:
-                user = CustomUser.objects.get(email=username_or_email)
-            except CustomUser.DoesNotExist:
-                raise serializers.ValidationError(
-                    'No active account found with the given credentials.',
-                    code='authorization'
-                )
-
-        # Check if user is active
-        if not user.is_active:
-            raise serializers.ValidationError(
-                'User account is disabled.',
-                code='authorization'
-            )
-
-        # Verify password
-        if not user.check_password(password):
+        self.user = authenticate(
+            request=self.context.get('request'),
+            username=username_or_email,
+            password=password,
+        )
+        if self.user is None:
             raise serializers.ValidationError(
                 'No active account found with the given credentials.',
                 code='authorization'
             )
 
-        # Update attrs with the actual username for token generation
-        attrs['username'] = user.username
+        refresh = self.get_token(self.user)
+        data = {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+        }
+
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
 
-        # Call parent validate to generate tokens
-        data = super().validate(attrs)
         return data
 
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Skill
         fields = ["id", "skill_name", "category"]
 
 
-class StudentSkillSetSerializer(serializers.ModelSerializer):
+class StudentSkillSetSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     student_profile = serializers.PrimaryKeyRelatedField(read_only=True)
     student_profile_id = serializers.PrimaryKeyRelatedField(
         queryset=StudentProfile.objects.all(),
@@ -153,7 +135,7 @@ class StudentSkillSetSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "student_profile", "skill"]
 
 
-class RequiredSkillSerializer(serializers.ModelSerializer):
+class RequiredSkillSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     job_posting = serializers.PrimaryKeyRelatedField(read_only=True)
     job_posting_id = serializers.PrimaryKeyRelatedField(
         queryset=JobPosting.objects.all(),
@@ -179,7 +161,7 @@ class RequiredSkillSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "job_posting", "skill"]
 
 
-class StudentProfileSerializer(serializers.ModelSerializer):
+class StudentProfileSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     user = CustomUserSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
         queryset=CustomUser.objects.all(),
@@ -206,7 +188,7 @@ class StudentProfileSerializer(serializers.ModelSerializer):
         ]
 
 
-class JobPostingSerializer(serializers.ModelSerializer):
+class JobPostingSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     tpo_user = CustomUserSerializer(read_only=True)
     tpo_user_id = serializers.PrimaryKeyRelatedField(
         queryset=CustomUser.objects.all(), source="tpo_user", write_only=True
@@ -230,7 +212,7 @@ class JobPostingSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "tpo_user", "posted_on", "required_skills"]
 
 
-class RoadmapSerializer(serializers.ModelSerializer):
+class RoadmapSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     profile = StudentProfileSerializer(read_only=True)
     profile_id = serializers.PrimaryKeyRelatedField(
         queryset=StudentProfile.objects.all(), source="profile", write_only=True
@@ -0,0 +1,54 @@
+"""
+Write paths that span several models.
+"""
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import CustomUser, StudentProfile, StudentSkillSet
+
+
+def register_user(password, name=None, phone=None, cgpa=0.0, **user_fields):
+    """
+    Create an active user and, for students, their profile.
+
+    The password is hashed before the transaction starts so the (slow) hash
+    does not hold database locks, and the profile is inserted fully
+    populated in the same transaction as the user instead of being created
+    blank by the ``create_student_profile`` signal and then updated. A TPO
+    only gets a profile when ``name`` and ``phone`` are given.
+    """
+    user = CustomUser(is_active=True, **user_fields)
+    user.set_password(password)
+    # Tell create_student_profile that the profile is taken care of.
+    user._profile_provisioned = True
+
+    if name and phone:
+        profile = StudentProfile(full_name=name, phone=phone, cgpa=cgpa)
+    elif not user.is_tpo:
+        profile = StudentProfile(full_name=user.get_full_name() or user.username, phone="", cgpa=0.0)
+    else:
+        profile = None
+
+    with transaction.atomic():
+        user.save()
+        if profile is not None:
+            profile.user = user
+            profile.save(force_insert=True)
+    return user
+
+
+def refresh_skill_counts(profiles):
+    """
+    Recompute ``skill_count`` for the ``profiles`` queryset in one UPDATE.
+    For writes that bypass the per-row signals (bulk_create, m2m add/remove).
+    """
+    counts = (
+        StudentSkillSet.objects.filter(student_profile=OuterRef("pk"))
+        .order_by()
+        .values("student_profile")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return profiles.update(skill_count=Coalesce(Subquery(counts), 0))
@@ -1,15 +1,21 @@
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from .models import CustomUser, StudentProfile
+from . import cache as me_cache
+from . import response_cache
+from . import services
+from .authentication import forget_token_version, remember_token_version
+from .models import CustomUser, JobPosting, RequiredSkill, Skill, StudentProfile, StudentSkillSet
 
 
 @receiver(post_save, sender=CustomUser)
 def create_student_profile(sender, instance, created, **kwargs):
     """
     Signal receiver to automatically create a StudentProfile when a new student user is created.
+    Users registered through services.register_user already come with one.
     """
-    if created and not instance.is_tpo:
+    if created and not instance.is_tpo and not getattr(instance, "_profile_provisioned", False):
         # Get full name from user, fallback to username if not available
         full_name = instance.get_full_name() or instance.username
         
@@ -20,3 +26,125 @@ def create_student_profile(sender, instance, created, **kwargs):
             cgpa=0.0,
         )
 
+
+@receiver(post_save, sender=CustomUser)
+def publish_token_version(sender, instance, **kwargs):
+    """
+    Keep the cached token version in sync so ClaimsJWTAuthentication rejects
+    tokens issued before a role change.
+    """
+    remember_token_version(instance)
+
+
+@receiver(post_delete, sender=CustomUser)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    forget_token_version(instance.pk)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_user_me_cache(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Drop the cached /me payloads of a changed user. The profile payload
+    embeds the user, so it goes too. Logins only touch ``last_login``,
+    which neither payload includes.
+    """
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    me_cache.invalidate_user(instance.pk)
+    for profile_id in StudentProfile.objects.filter(user_id=instance.pk).values_list("pk", flat=True):
+        me_cache.invalidate_profile(profile_id)
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+def invalidate_profile_me_cache(sender, instance, **kwargs):
+    me_cache.invalidate_profile(instance.pk)
+
+
+@receiver(post_save, sender=StudentSkillSet)
+@receiver(post_delete, sender=StudentSkillSet)
+def invalidate_skill_assignment_me_cache(sender, instance, **kwargs):
+    me_cache.invalidate_profile(instance.student_profile_id)
+
+
+@receiver(post_save, sender=StudentSkillSet)
+def count_added_skill(sender, instance, created, **kwargs):
+    if created:
+        StudentProfile.objects.filter(pk=instance.student_profile_id).update(skill_count=F("skill_count") + 1)
+
+
+@receiver(post_delete, sender=StudentSkillSet)
+def count_removed_skill(sender, instance, **kwargs):
+    StudentProfile.objects.filter(pk=instance.student_profile_id, skill_count__gt=0).update(
+        skill_count=F("skill_count") - 1
+    )
+
+
+@receiver(m2m_changed, sender=StudentProfile.skills.through)
+def recount_m2m_skills(sender, instance, action, reverse, pk_set, **kwargs):
+    # ``profile.skills.add()`` and ``.remove()`` bypass the per-row signals.
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # skill.student_profiles.*(): pk_set holds profile ids (None on clear).
+        profiles = StudentProfile.objects.filter(pk__in=pk_set) if pk_set else StudentProfile.objects.all()
+    else:
+        profiles = StudentProfile.objects.filter(pk=instance.pk)
+    services.refresh_skill_counts(profiles)
+    response_cache.invalidate("studentprofile")
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def invalidate_skill_me_cache(sender, instance, **kwargs):
+    # Skill names are embedded in every profile that uses them.
+    me_cache.invalidate_all()
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def invalidate_skill_responses(sender, instance, **kwargs):
+    response_cache.invalidate("skill", f"skill:{instance.pk}")
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+@receiver(post_save, sender=StudentSkillSet)
+@receiver(post_delete, sender=StudentSkillSet)
+def invalidate_student_analytics(sender, instance, **kwargs):
+    # The TPO dashboard's analytics count profiles and skill assignments.
+    response_cache.invalidate("studentprofile")
+
+
+@receiver(post_save, sender=JobPosting)
+@receiver(post_delete, sender=JobPosting)
+def invalidate_job_posting_responses(sender, instance, **kwargs):
+    response_cache.invalidate("jobposting", f"jobposting:{instance.pk}")
+
+
+@receiver(post_save, sender=RequiredSkill)
+@receiver(post_delete, sender=RequiredSkill)
+def invalidate_required_skill_responses(sender, instance, **kwargs):
+    response_cache.invalidate("jobposting", f"jobposting:{instance.job_posting_id}")
+
+
+@receiver(m2m_changed, sender=JobPosting.required_skills.through)
+def invalidate_required_skills_m2m_responses(sender, instance, action, reverse, pk_set, **kwargs):
+    # ``job.required_skills.add()`` bulk-creates RequiredSkill rows without post_save.
+    if not action.startswith("post_"):
+        return
+    job_ids = (pk_set or ()) if reverse else [instance.pk]
+    response_cache.invalidate("jobposting", *(f"jobposting:{pk}" for pk in job_ids))
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_user_responses(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Job postings embed their TPO user. Logins only touch ``last_login``,
+    which is not part of any cached response.
+    """
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    response_cache.invalidate("user")
@@ -0,0 +1,302 @@
+"""
+Lightweight request tracing.
+
+``TracingMiddleware`` opens a root span per sampled request; inside it,
+spans are opened around every serializer (``metrics.serializer_timer``),
+every database query (the hook ``core/db.py`` installs), every LLM attempt
+(``metrics.llm_timer``) and any block wrapped in ``span()``. The current
+span lives in a context variable, so children attach to the right parent
+across threads and the async ORM.
+
+Settings:
+
+* ``TRACING_EXPORTER``: ``""`` (off), ``"jsonl"`` (one span per line in
+  ``TRACING_FILE``) or ``"otlp"`` (OTLP/HTTP JSON to
+  ``TRACING_OTLP_ENDPOINT``, e.g. a local OpenTelemetry Collector).
+* ``TRACING_SAMPLE_RATE``: fraction of requests traced. An incoming W3C
+  ``traceparent`` header's sampled flag takes precedence, so a trace
+  started upstream continues here.
+* ``TRACING_MAX_SPANS``: spans kept per trace; the rest are counted in the
+  root span's ``tracing.dropped_spans`` attribute.
+
+Unsampled requests only pay for the sampling decision: every ``span()``
+call then returns straight away. Finished traces are exported from a
+background thread so requests never wait on disk or the collector.
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+MAX_STATEMENT_LENGTH = 2000
+
+
+class Trace:
+    __slots__ = ("trace_id", "spans", "dropped", "max_spans")
+
+    def __init__(self, trace_id, max_spans):
+        self.trace_id = trace_id
+        self.spans = []
+        self.dropped = 0
+        self.max_spans = max_spans
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace, parent_id, name, kind, attributes):
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.error = None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def as_dict(self):
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+_current_span = contextvars.ContextVar("acroconnect_trace_span", default=None)
+
+
+def current_span():
+    return _current_span.get()
+
+
+def _run_span(span):
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Record the block as a child of the current span. Yields the ``Span``,
+    or ``None`` when the request is not being traced.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    trace = parent.trace
+    if len(trace.spans) >= trace.max_spans:
+        trace.dropped += 1
+        yield None
+        return
+    child = Span(trace, parent.span_id, name, "internal", attributes)
+    trace.spans.append(child)
+    yield from _run_span(child)
+
+
+def sampling_decision(traceparent):
+    """``(trace_id, parent_id)`` for a request to trace, or ``None``."""
+    match = TRACEPARENT_RE.match(traceparent or "")
+    if match:
+        trace_id, parent_id, flags = match.groups()
+        return (trace_id, parent_id) if int(flags, 16) & 1 else None
+    if settings.TRACING_EXPORTER and random.random() < settings.TRACING_SAMPLE_RATE:
+        return f"{random.getrandbits(128):032x}", None
+    return None
+
+
+@contextmanager
+def trace_request(request):
+    """
+    Open the root span for ``request`` when it is sampled; yields the span
+    or ``None``. The trace is exported when the block exits.
+    """
+    decision = sampling_decision(request.META.get("HTTP_TRACEPARENT")) if settings.TRACING_EXPORTER else None
+    if decision is None:
+        yield None
+        return
+    trace_id, parent_id = decision
+    trace = Trace(trace_id, settings.TRACING_MAX_SPANS)
+    root = Span(trace, parent_id, f"{request.method} {request.path}", "server", {
+        "http.method": request.method,
+        "http.target": request.get_full_path(),
+    })
+    trace.spans.append(root)
+    try:
+        yield from _run_span(root)
+    finally:
+        if trace.dropped:
+            root.set("tracing.dropped_spans", trace.dropped)
+        get_exporter().submit(trace.spans)
+
+
+def db_wrapper(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook opening a span per query."""
+    if _current_span.get() is None:
+        return execute(sql, params, many, context)
+    connection = context["connection"]
+    with span(
+        "db.query",
+        **{"db.system": connection.vendor, "db.alias": connection.alias, "db.statement": sql[:MAX_STATEMENT_LENGTH]},
+    ):
+        return execute(sql, params, many, context)
+
+
+class JSONLinesWriter:
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, spans):
+        with open(self.path, "a", encoding="utf-8") as output:
+            output.writelines(json.dumps(span.as_dict(), default=str) + "\n" for span in spans)
+
+
+class OTLPWriter:
+    """Posts spans as OTLP/HTTP JSON (``/v1/traces``)."""
+
+    STATUS_OK, STATUS_ERROR = 1, 2
+    KINDS = {"internal": 1, "server": 2}
+
+    def __init__(self, endpoint, service_name):
+        self.endpoint = endpoint
+        self.resource = {"attributes": [self.attribute("service.name", service_name)]}
+
+    @staticmethod
+    def attribute(key, value):
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        return {"key": key, "value": typed}
+
+    def encode(self, span):
+        encoded = {
+            "traceId": span.trace.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": self.KINDS[span.kind],
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [self.attribute(key, value) for key, value in span.attributes.items()],
+            "status": {"code": self.STATUS_ERROR, "message": span.error} if span.error else {"code": self.STATUS_OK},
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+    def write(self, spans):
+        body = json.dumps({"resourceSpans": [{
+            "resource": self.resource,
+            "scopeSpans": [{"scope": {"name": "acroconnect"}, "spans": [self.encode(span) for span in spans]}],
+        }]}).encode()
+        request = urllib.request.Request(
+            self.endpoint, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+
+
+class BackgroundExporter:
+    """
+    Hands finished traces to ``writer`` on a daemon thread. When the queue is
+    full (the collector is down or slow) new traces are dropped.
+    """
+
+    def __init__(self, writer, max_queue=1000):
+        self.writer = writer
+        self.queue = queue.Queue(max_queue)
+        self.thread = threading.Thread(target=self.run, name="trace-exporter", daemon=True)
+        self.thread.start()
+
+    def submit(self, spans):
+        try:
+            self.queue.put_nowait(spans)
+        except queue.Full:
+            logger.warning("Trace export queue is full; dropping a trace")
+
+    def run(self):
+        while True:
+            spans = self.queue.get()
+            try:
+                if spans is not None:
+                    self.writer.write(spans)
+            except Exception:
+                logger.exception("Could not export a trace")
+            finally:
+                self.queue.task_done()
+            if spans is None:
+                return
+
+    def flush(self):
+        self.queue.join()
+
+    def shutdown(self):
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            if settings.TRACING_EXPORTER == "otlp":
+                writer = OTLPWriter(settings.TRACING_OTLP_ENDPOINT, settings.TRACING_SERVICE_NAME)
+            else:
+                writer = JSONLinesWriter(settings.TRACING_FILE)
+            _exporter = BackgroundExporter(writer)
+            atexit.register(_exporter.shutdown)
+        return _exporter
+
+
+def flush():
+    """Wait until every finished trace has been exported."""
+    if _exporter is not None:
+        _exporter.flush()
+
+
+@receiver(setting_changed)
+def reset_exporter(setting, **kwargs):
+    global _exporter
+    if setting.startswith("TRACING_") and _exporter is not None:
+        _exporter.shutdown()
+        _exporter = None
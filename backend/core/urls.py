@@ -11,6 +11,9 @@ from .views import (
     GenerateRoadmapView,
     CurrentUserView,
     ListGenaiModelsView,
+    StudentHomePageView,
+    StudentTableView,
+    TPODashboardPageView,
 )
 
 router = DefaultRouter()
@@ -26,5 +29,8 @@ urlpatterns = [
     path("generate-roadmap/", GenerateRoadmapView.as_view(), name="generate-roadmap"),
     path("users/me/", CurrentUserView.as_view(), name="current-user"),
     path("genai-models/", ListGenaiModelsView.as_view(), name="genai-models"),
+    path("pages/student-home/", StudentHomePageView.as_view(), name="page-student-home"),
+    path("pages/tpo-dashboard/", TPODashboardPageView.as_view(), name="page-tpo-dashboard"),
+    path("pages/tpo-dashboard/students/", StudentTableView.as_view(), name="page-tpo-students"),
 ]
 
@@ -1,8 +1,15 @@
 import os
 import logging
 
-from rest_framework import permissions, status, viewsets
+from django.db.models import Prefetch
+from django.db.models.functions import Lower
+from django.http import HttpResponse, HttpResponseForbidden
+from django.shortcuts import get_object_or_404
+from django.views import View
+from rest_framework import generics, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import SearchFilter
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -22,12 +29,23 @@ except ImportError:
 # module logger
 logger = logging.getLogger(__name__)
 
+from . import cache as me_cache
+from . import db_routers
+from . import fast_serializers
+from . import metrics
+from . import pages
+from . import tracing
+from .fast_serializers import FastListMixin
+from .pagination import OptInPageNumberPagination, StudentTablePagination
+from .permissions import IsTPO
+from .response_cache import CachedResponseMixin
 from .models import (
     CustomUser,
     StudentProfile,
     Skill,
     JobPosting,
     Roadmap,
+    RequiredSkill,
     StudentSkillSet,
 )
 from .serializers import (
@@ -43,6 +61,17 @@ from .serializers import (
 
 
 
+def number_param(request, name, cast):
+    """Query parameter ``name`` converted with ``cast``; ``None`` when absent, 400 when invalid."""
+    value = request.query_params.get(name, "").strip()
+    if not value:
+        return None
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValidationError({name: "A number is required."})
+
+
 class CustomUserViewSet(viewsets.ModelViewSet):
     queryset = CustomUser.objects.all()
     serializer_class = CustomUserSerializer
@@ -58,11 +87,11 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         """
         Get the current authenticated user's data.
         """
-        serializer = self.get_serializer(request.user)
-        return Response(serializer.data)
+        return Response(pages.user_payload(request.user))
 
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    cache_tags = {"list": ["skill"], "retrieve": ["skill:{pk}"]}
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -74,44 +103,88 @@ class StudentSkillSetViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class StudentProfileViewSet(viewsets.ModelViewSet):
-    queryset = StudentProfile.objects.select_related("user").prefetch_related("student_skill_set__skill")
+class StudentProfileViewSet(FastListMixin, viewsets.ModelViewSet):
+    # Nested skills in insertion order, as fast_serializers lists them.
+    queryset = StudentProfile.objects.select_related("user").prefetch_related(
+        Prefetch("student_skill_set", queryset=StudentSkillSet.objects.select_related("skill").order_by("pk"))
+    )
     serializer_class = StudentProfileSerializer
+    fast_list = staticmethod(fast_serializers.student_profiles)
     permission_classes = [permissions.IsAuthenticated]
 
     @action(detail=False, methods=["get", "patch"], permission_classes=[permissions.IsAuthenticated])
     def me(self, request):
         """
         Retrieve or update the authenticated student's profile.
-        Automatically creates a profile if one is missing.
+        Profiles are provisioned at registration, so GET never writes.
         """
-        profile, _ = StudentProfile.objects.get_or_create(
-            user=request.user,
-            defaults={
-                "full_name": request.user.get_full_name() or request.user.username,
-                "phone": "",
-                "cgpa": 0.0,
-            },
-        )
-
         if request.method.lower() == "patch":
+            profile = get_object_or_404(self.get_queryset(), user_id=request.user.pk)
             serializer = self.get_serializer(profile, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
             serializer.save()
             return Response(serializer.data)
 
-        serializer = self.get_serializer(profile)
-        return Response(serializer.data)
-
-
-class JobPostingViewSet(viewsets.ModelViewSet):
-    queryset = JobPosting.objects.select_related("tpo_user").prefetch_related("required_skills_details__skill")
+        profile_id = getattr(request.user, "profile_id", None)
+        if profile_id is None:
+            profile_id = get_object_or_404(
+                StudentProfile.objects.values_list("pk", flat=True), user_id=request.user.pk
+            )
+        data = me_cache.get_profile_payload(
+            profile_id,
+            lambda: self.get_serializer(get_object_or_404(self.get_queryset(), pk=profile_id)).data,
+        )
+        return Response(data)
+
+
+class JobPostingViewSet(CachedResponseMixin, FastListMixin, viewsets.ModelViewSet):
+    # Postings embed their TPO user and required skills.
+    cache_tags = {
+        "list": ["jobposting", "skill", "user"],
+        "retrieve": ["jobposting:{pk}", "skill", "user"],
+    }
+    queryset = JobPosting.objects.select_related("tpo_user").prefetch_related(
+        Prefetch("required_skills_details", queryset=RequiredSkill.objects.select_related("skill").order_by("pk"))
+    )
     serializer_class = JobPostingSerializer
+    fast_list = staticmethod(fast_serializers.job_postings)
+    compact_list = staticmethod(fast_serializers.job_posting_summaries)
     permission_classes = [permissions.IsAuthenticated]
+    # Opt-in paging (?page_size=), ?search= across title, company and
+    # description, ?company= (case-insensitive, served by the Lower index)
+    # and ?tpo_user= (the poster's user id; an explicit id rather than "mine",
+    # because cached responses are shared by every user sending the query).
+    pagination_class = OptInPageNumberPagination
+    filter_backends = [SearchFilter]
+    search_fields = ["title", "company", "description"]
+
+    def get_queryset(self):
+        # The pk tie-breaker keeps pages stable when postings share a timestamp.
+        queryset = super().get_queryset().order_by("-posted_on", "-pk")
+        company = self.request.query_params.get("company")
+        if company:
+            queryset = queryset.alias(company_lower=Lower("company")).filter(company_lower=company.lower())
+        tpo_user = number_param(self.request, "tpo_user", int)
+        if tpo_user is not None:
+            queryset = queryset.filter(tpo_user_id=tpo_user)
+        return queryset
+
+    @action(detail=False, methods=["get"])
+    def companies(self, request):
+        """Distinct company names, for the job board's company filter."""
+        names = (
+            JobPosting.objects.exclude(company="")
+            .order_by("company")
+            .values_list("company", flat=True)
+            .distinct()
+        )
+        return Response(list(names))
 
 
 class RoadmapViewSet(viewsets.ModelViewSet):
-    queryset = Roadmap.objects.select_related("profile", "profile__user")
+    queryset = Roadmap.objects.select_related("profile", "profile__user").prefetch_related(
+        "profile__student_skill_set__skill"
+    )
     serializer_class = RoadmapSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -121,28 +194,34 @@ class GenerateRoadmapView(APIView):
 
     def post(self, request, *args, **kwargs):
         try:
-            profile = request.user.student_profile
+            with tracing.span("roadmap.load_profile"):
+                profile = (
+                    StudentProfile.objects.select_related("user")
+                    .prefetch_related("student_skill_set__skill")
+                    .get(user_id=request.user.pk)
+                )
         except StudentProfile.DoesNotExist:
             return Response(
                 {"detail": "Student profile not found for the current user."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Fetch student's skills from StudentSkillSet
-        skill_assignments = profile.student_skill_set.select_related("skill").all()
-        skills_list = []
-        for assignment in skill_assignments:
-            skill_name = assignment.skill.skill_name
-            skill_level = assignment.skill_level
-            skills_list.append(f"{skill_name}: {skill_level}/5")
+        with tracing.span("roadmap.build_prompt"):
+            # Fetch student's skills from StudentSkillSet
+            skill_assignments = profile.student_skill_set.all()
+            skills_list = []
+            for assignment in skill_assignments:
+                skill_name = assignment.skill.skill_name
+                skill_level = assignment.skill_level
+                skills_list.append(f"{skill_name}: {skill_level}/5")
 
-        skills_text = ", ".join(skills_list) if skills_list else "No skills specified yet."
+            skills_text = ", ".join(skills_list) if skills_list else "No skills specified yet."
 
-        # Fetch career goal from profile
-        career_goal = profile.career_goal or "Not specified"
+            # Fetch career goal from profile
+            career_goal = profile.career_goal or "Not specified"
 
-        # Build detailed prompt for AI
-        prompt = f"""You are a career guidance AI assistant. Create a personalized learning roadmap for a student.
+            # Build detailed prompt for AI
+            prompt = f"""You are a career guidance AI assistant. Create a personalized learning roadmap for a student.
 
 Student Information:
 - Name: {profile.full_name}
@@ -190,7 +269,8 @@ Format the roadmap in a clear, structured way with sections and bullet points.""
             for candidate in models_to_try:
                 try:
                     model = genai.GenerativeModel(candidate)
-                    response = model.generate_content(prompt)
+                    with metrics.llm_timer(candidate):
+                        response = model.generate_content(prompt)
 
                     # Prefer .text if available
                     if hasattr(response, "text") and response.text:
@@ -231,7 +311,8 @@ Format the roadmap in a clear, structured way with sections and bullet points.""
             )
 
         # Save the roadmap
-        roadmap = Roadmap.objects.create(profile=profile, roadmap_text=roadmap_text)
+        with tracing.span("roadmap.save"):
+            roadmap = Roadmap.objects.create(profile=profile, roadmap_text=roadmap_text)
         serializer = RoadmapSerializer(roadmap)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -250,8 +331,77 @@ class CurrentUserView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        serializer = CustomUserSerializer(request.user)
-        return Response(serializer.data)
+        return Response(pages.user_payload(request.user))
+
+
+class StudentHomePageView(APIView):
+    """
+    Everything the student profile and roadmap pages render, in one response.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response(pages.student_home(request.user))
+
+
+class TPODashboardPageView(APIView):
+    """
+    Everything the TPO dashboard renders, in one response.
+    """
+    permission_classes = [IsTPO]
+
+    def get(self, request):
+        return Response(pages.tpo_dashboard(request.user))
+
+
+class StudentTableView(FastListMixin, generics.ListAPIView):
+    """
+    One page of the TPO dashboard's student table.
+
+    ``ordering`` is ``name``, ``cgpa`` or ``skill_count``, prefixed with "-"
+    for descending. Filters: ``skill`` (a skill id), ``cgpa_min`` and
+    ``cgpa_max``, and ``name`` (a case-insensitive prefix of the full name).
+    Every sort key is indexed and the primary key breaks ties, so a page
+    costs about the same at any cohort size.
+    """
+    permission_classes = [IsTPO]
+    queryset = StudentProfile.objects.all()
+    fast_list = staticmethod(fast_serializers.student_table_rows)
+    pagination_class = StudentTablePagination
+    ORDERINGS = {"name": "full_name", "cgpa": "cgpa", "skill_count": "skill_count"}
+
+    def get_queryset(self):
+        params = self.request.query_params
+        queryset = super().get_queryset()
+
+        skill = number_param(self.request, "skill", int)
+        if skill is not None:
+            queryset = queryset.filter(
+                pk__in=StudentSkillSet.objects.filter(skill_id=skill).values("student_profile_id")
+            )
+        cgpa_min = number_param(self.request, "cgpa_min", float)
+        if cgpa_min is not None:
+            queryset = queryset.filter(cgpa__gte=cgpa_min)
+        cgpa_max = number_param(self.request, "cgpa_max", float)
+        if cgpa_max is not None:
+            queryset = queryset.filter(cgpa__lte=cgpa_max)
+        term = params.get("name", "").strip().lower()
+        if term:
+            # Same index-friendly prefix range as ScalableAdminMixin.
+            upper = term[:-1] + chr(ord(term[-1]) + 1)
+            queryset = queryset.alias(name_lower=Lower("full_name")).filter(
+                name_lower__gte=term, name_lower__lt=upper, name_lower__startswith=term
+            )
+
+        ordering = params.get("ordering", "name")
+        descending = ordering.startswith("-")
+        field = self.ORDERINGS.get(ordering.lstrip("-"))
+        if field is None:
+            choices = ", ".join(self.ORDERINGS)
+            raise ValidationError({"ordering": f"Use one of: {choices}, optionally prefixed with -."})
+        if descending:
+            return queryset.order_by(f"-{field}", "-pk")
+        return queryset.order_by(field, "pk")
 
 
 class ListGenaiModelsView(APIView):
@@ -309,4 +459,21 @@ class ListGenaiModelsView(APIView):
             import traceback
 
             traceback.print_exc()
-            return Response({"detail": f"Error listing models: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({"detail": f"Error listing models: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class MetricsView(View):
+    """
+    Prometheus scrape endpoint, aggregated across all worker processes.
+    Only reachable from the addresses and networks in METRICS_ALLOWED_IPS.
+    """
+
+    def get(self, request):
+        if not metrics.scraper_allowed(request.META.get("REMOTE_ADDR", "")):
+            return HttpResponseForbidden()
+        gauges = []
+        lag = db_routers.replica_lag_seconds()
+        if lag is not None:
+            gauges.append(("acroconnect_db_replica_lag_seconds", {"database": db_routers.REPLICA_ALIAS}, lag))
+        body = metrics.render_prometheus(metrics.registry.collect(), gauges)
+        return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,17 @@
+"""
+gunicorn settings, picked up automatically when gunicorn starts in backend/.
+
+Every worker process keeps its own database pool of GUNICORN_THREADS
+connections (see DATABASES in settings.py), so Postgres sees at most
+GUNICORN_WORKERS * GUNICORN_THREADS connections from one container; keep
+that below the server's max_connections.
+"""
+
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "3"))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+worker_class = "gthread" if threads > 1 else "sync"
+# Roadmap generation waits on the Gemini API.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
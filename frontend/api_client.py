@@ -0,0 +1,168 @@
+"""
+HTTP client for the AcroConnect backend API.
+
+One ``ApiClient`` per user session (see ``get_client`` in app.py) keeps a
+pooled ``requests.Session``, so calls reuse keep-alive connections instead
+of opening a new one each time. Reads are retried with backoff on
+connection errors and 502/503/504 responses; writes only when the
+connection could not be made, so a request never reaches the server twice.
+Every failure surfaces as ``ApiError`` with the backend's message already
+decoded, and every call's latency is logged; calls slower than
+``SLOW_CALL_SECONDS`` are logged as warnings.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger("acroconnect.api")
+
+API_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
+SLOW_CALL_SECONDS = float(os.getenv("API_SLOW_CALL_SECONDS", "0.5"))
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+class ApiError(Exception):
+    """A failed API call: ``status`` is ``None`` when no response arrived."""
+
+    def __init__(self, message, status=None, data=None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.data = data
+
+    @classmethod
+    def from_response(cls, response, data):
+        if isinstance(data, dict):
+            message = data.get("detail") or data.get("message") or str(data)
+        elif data is not None:
+            message = str(data)
+        else:
+            message = response.text or f"HTTP {response.status_code}"
+        return cls(message, response.status_code, data)
+
+
+class CallTiming:
+    __slots__ = ("method", "path", "status", "started", "seconds", "thread")
+
+    def __init__(self, method, path, status, started):
+        self.method = method
+        self.path = path
+        self.status = status
+        self.started = started
+        self.seconds = time.perf_counter() - started
+        self.thread = threading.current_thread().name
+
+
+class ApiClient:
+    """
+    Calls ``base_url`` as the user owning ``token`` (anonymously without
+    one). With ``use_msgpack`` responses are requested as MessagePack when
+    the ``msgpack`` package is installed; request bodies stay JSON.
+    """
+
+    # urllib3 retries connect errors for every method; read errors and the
+    # listed statuses only for ``allowed_methods``. A DELETE whose first
+    # attempt reached the server would otherwise come back as a 404.
+    RETRY = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        raise_on_status=False,
+    )
+
+    def __init__(self, base_url=API_URL, token=None, timeout=10, use_msgpack=False, pool_size=10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=self.RETRY)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        if use_msgpack and msgpack is not None:
+            self.session.headers["Accept"] = MSGPACK_MEDIA_TYPE
+        # The most recent calls, newest last, for the debug panel.
+        self.timings = deque(maxlen=50)
+
+    def request(self, method, path, *, params=None, json=None, data=None, timeout=None):
+        """
+        Call ``path`` and return the decoded body (``None`` when empty).
+        Raises ``ApiError`` for transport errors and non-2xx responses.
+        """
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, url, params=params, json=json, data=data, timeout=timeout or self.timeout
+            )
+        except requests.RequestException as exc:
+            self.record(method, path, None, start)
+            raise ApiError(str(exc)) from exc
+        self.record(method, path, response.status_code, start)
+
+        body = self.decode(response)
+        if not response.ok:
+            raise ApiError.from_response(response, body)
+        return body
+
+    def decode(self, response):
+        if not response.content:
+            return None
+        if response.headers.get("Content-Type", "").startswith(MSGPACK_MEDIA_TYPE) and msgpack is not None:
+            return msgpack.unpackb(response.content)
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    def record(self, method, path, status, started):
+        timing = CallTiming(method, path, status, started)
+        self.timings.append(timing)
+        level = logging.WARNING if timing.seconds >= SLOW_CALL_SECONDS else logging.DEBUG
+        logger.log(level, "%s %s -> %s in %.0f ms", method, path, status or "error", timing.seconds * 1000)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request("PATCH", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def iter_pages(self, path, params=None):
+        """
+        Yield every item of a list endpoint, following ``next`` links when
+        the endpoint is paginated (``{"results": [...], "next": url}``).
+        """
+        body = self.get(path, params=params)
+        while True:
+            if isinstance(body, list):
+                yield from body
+                return
+            yield from body.get("results", [])
+            if not body.get("next"):
+                return
+            body = self.get(body["next"])
+
+    def get_all(self, path, params=None):
+        return list(self.iter_pages(path, params))
+
+    def close(self):
+        self.session.close()
@@ -1,13 +1,16 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 import pandas as pd
-import requests
-
 
+from api_client import API_URL, ApiClient, ApiError
 
-# API base URL
-
-API_URL = "http://127.0.0.1:8000"
+DEBUG_PANEL = os.getenv("ACROCONNECT_DEBUG") == "1"
 
 
 
@@ -51,258 +54,324 @@ def reset_session_state() -> None:
 
 
 
-def show_login_page() -> None:
+@st.cache_resource(scope="session", on_release=ApiClient.close, show_spinner=False)
+def get_client(token):
+    """One pooled API client per session and access token."""
+    return ApiClient(API_URL, token)
 
-    st.title("Welcome to AcroConnect")
 
-    login_tab, register_tab = st.tabs(["Login", "Register (New Student)"])
+def api() -> ApiClient:
+    return get_client(st.session_state.token)
 
 
+# Cached reads, keyed by access token so users never see each other's data.
+# The TTL bounds how stale data changed by someone else can get; the user's
+# own changes go through mutate(), which drops the affected entries at once.
 
-    with login_tab:
+@st.cache_data(ttl=300, max_entries=1000, show_spinner=False)
+def fetch_student_home(token):
+    """Profile, skill catalog and own roadmaps for the student pages."""
+    return get_client(token).get("/api/v1/pages/student-home/")
 
-        st.subheader("Login")
 
-        with st.form("login_form", clear_on_submit=False):
+@st.cache_data(ttl=120, max_entries=1000, show_spinner=False)
+def fetch_tpo_dashboard(token):
+    """The dashboard's analytics and the skill catalog for its filters."""
+    return get_client(token).get("/api/v1/pages/tpo-dashboard/")
 
-            login_identifier = st.text_input("Username or Email", key="login_identifier")
 
-            password = st.text_input("Password", type="password", key="login_password")
+@st.cache_data(ttl=600, max_entries=1000, show_spinner=False)
+def fetch_companies(token):
+    return get_client(token).get("/api/v1/job-postings/companies/")
 
-            submitted = st.form_submit_button("Log In")
 
+CACHED_FETCHES = (fetch_student_home, fetch_tpo_dashboard, fetch_companies)
 
+# Paged reads take more arguments than the token, so mutate() drops every
+# cached page of them at once rather than just the current user's.
+JOB_BOARD_PAGE_SIZE = 20
+ALL_COMPANIES = "All companies"
 
-        if submitted:
-
-            if not login_identifier or not password:
-
-                st.error("Please enter both username/email and password.")
-
-            else:
-
-                try:
-
-                    # Django token endpoint requires 'username' field
-
-                    # Send the identifier as username (works for both username and email)
-
-                    payload = {"username": login_identifier, "password": password}
-
-                    response = requests.post(
-
-                        f"{API_URL}/api/token/",
 
-                        data=payload,
+@st.cache_data(ttl=120, max_entries=1000, show_spinner=False)
+def fetch_job_board_page(token, page, search, company):
+    """One page of compact job board rows, filtered by the backend."""
+    params = {"compact": 1, "page_size": JOB_BOARD_PAGE_SIZE, "page": page}
+    if search:
+        params["search"] = search
+    if company:
+        params["company"] = company
+    return get_client(token).get("/api/v1/job-postings/", params=params)
 
-                        timeout=10,
 
-                    )
+@st.cache_data(ttl=300, max_entries=1000, show_spinner=False)
+def fetch_job_posting(token, job_id):
+    return get_client(token).get(f"/api/v1/job-postings/{job_id}/")
 
-                    if response.status_code != 200:
 
-                        # If login fails, show the error
+@st.cache_data(ttl=120, max_entries=1000, show_spinner=False)
+def fetch_posted_jobs_page(token, user_id, page):
+    """One page of the postings ``user_id`` made, filtered by the backend."""
+    params = {"tpo_user": user_id, "page_size": JOB_BOARD_PAGE_SIZE, "page": page}
+    return get_client(token).get("/api/v1/job-postings/", params=params)
 
-                        try:
 
-                            error_data = response.json()
-
-                            error_message = (
-
-                                error_data.get("detail")
-
-                                or error_data.get("message")
+STUDENT_TABLE_PAGE_SIZE = 25
+STUDENT_TABLE_SORTS = {
+    "Name (A-Z)": "name",
+    "Name (Z-A)": "-name",
+    "CGPA (high to low)": "-cgpa",
+    "CGPA (low to high)": "cgpa",
+    "Most skills": "-skill_count",
+    "Fewest skills": "skill_count",
+}
 
-                                or str(error_data)
 
-                            )
+@st.cache_data(ttl=120, max_entries=1000, show_spinner=False)
+def fetch_student_table_page(token, query):
+    """One sorted, filtered page of the TPO student table; ``query`` is a tuple of params."""
+    return get_client(token).get("/api/v1/pages/tpo-dashboard/students/", params=dict(query))
 
-                        except ValueError:
 
-                            error_message = response.text or "Unable to log in."
+def mutate(method, path, invalidates, **kwargs):
+    """
+    Send a write request, then drop the current user's cached copies of the
+    fetches in ``invalidates`` (every cached page of the paged fetches).
+    Failed requests invalidate nothing.
+    """
+    result = api().request(method, path, **kwargs)
+    for fetch in invalidates:
+        if fetch in CACHED_FETCHES:
+            fetch.clear(st.session_state.token)
+        else:
+            fetch.clear()
+    return result
+
+
+def forget_cached_data() -> None:
+    for fetch in CACHED_FETCHES:
+        fetch.clear(st.session_state.token)
+
+
+# Optimistic edits inside fragments: a widget callback applies the edit to
+# the fragment's local copy of its items and queues the API call, the
+# fragment redraws the edited items at once, and send_queued_edit() then
+# makes the one call and redraws just the fragment with the server's answer.
+
+def queue_edit(key, items, method, path, invalidates, *, success, failure, json=None, reconcile=None):
+    """
+    Replace the items under ``key`` with ``items`` and queue the request.
+    ``reconcile(items, response)`` folds the server's response back into
+    the items; on failure the previous items are restored.
+    """
+    st.session_state[f"{key}_pending"] = {
+        "method": method,
+        "path": path,
+        "json": json,
+        "invalidates": invalidates,
+        "reconcile": reconcile,
+        "rollback": st.session_state[f"{key}_items"],
+        "success": success,
+        "failure": failure,
+    }
+    st.session_state[f"{key}_items"] = items
+
+
+def send_queued_edit(key) -> None:
+    pending = st.session_state.pop(f"{key}_pending", None)
+    if pending is None:
+        return
+    try:
+        result = mutate(pending["method"], pending["path"], pending["invalidates"], json=pending["json"])
+    except ApiError as exc:
+        st.session_state[f"{key}_items"] = pending["rollback"]
+        st.session_state[f"{key}_notice"] = ("error", f"{pending['failure']}: {exc.message}")
+    else:
+        if pending["reconcile"]:
+            st.session_state[f"{key}_items"] = pending["reconcile"](st.session_state[f"{key}_items"], result)
+        st.session_state[f"{key}_notice"] = ("success", pending["success"])
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        # The edit was queued during a full run, not a fragment rerun.
+        st.rerun()
 
-                        st.error(f"Login failed: {error_message}")
 
-                        return
+def show_edit_notice(key) -> None:
+    notice = st.session_state.pop(f"{key}_notice", None)
+    if notice:
+        kind, message = notice
+        (st.error if kind == "error" else st.success)(message)
 
-                    # If we reach here, status code is 200
-                    data = response.json()
 
-                    token = data.get("access") or data.get("token")
+class PageData:
+    """Results of ``load_page_data``; ``get`` re-raises a fetch's ApiError."""
 
-                    if not token:
+    def __init__(self, results):
+        self.results = results
 
-                        st.error("Login failed: token missing in response.")
+    def get(self, name):
+        result = self.results[name]
+        if isinstance(result, ApiError):
+            raise result
+        return result
 
-                        return
 
-                    st.session_state.token = token
+def load_page_data(**fetches) -> PageData:
+    """
+    Run a page's independent fetches concurrently, so the page waits for the
+    slowest backend round trip instead of their sum. Each fetch is called
+    with the current token; timings are kept for the debug panel.
+    """
+    token = st.session_state.token
+    ctx = get_script_run_ctx()
 
-                    st.session_state.logged_in = True
+    def run(fetch):
+        # Streamlit's caches and session-scoped resources need the session's
+        # script context, which worker threads don't inherit.
+        add_script_run_ctx(ctx=ctx)
+        start = time.perf_counter()
+        try:
+            return fetch(token), time.perf_counter() - start
+        except ApiError as exc:
+            return exc, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(fetches), thread_name_prefix="page-data") as pool:
+        futures = {name: pool.submit(run, fetch) for name, fetch in fetches.items()}
+        outcomes = {name: future.result() for name, future in futures.items()}
+    timings = st.session_state.setdefault("page_data_timings", [])
+    timings.append({
+        "fetches": {name: seconds for name, (_, seconds) in outcomes.items()},
+        "wall": time.perf_counter() - start,
+    })
+    return PageData({name: result for name, (result, _) in outcomes.items()})
+
+
+def debug_enabled() -> bool:
+    return DEBUG_PANEL or st.query_params.get("debug") == "1"
+
+
+def show_debug_panel(page_start) -> None:
+    """Sidebar breakdown of this run's page-data fetches and HTTP calls."""
+    with st.sidebar.expander("Debug: request timings"):
+        for batch in st.session_state.get("page_data_timings", []):
+            summed = sum(batch["fetches"].values())
+            st.caption(f"Page data: {batch['wall'] * 1000:.0f} ms wall, {summed * 1000:.0f} ms if sequential")
+            st.dataframe(pd.DataFrame(
+                [{"Resource": name, "ms": round(seconds * 1000, 1)} for name, seconds in batch["fetches"].items()]
+            ), hide_index=True)
+        calls = [timing for timing in api().timings if timing.started >= page_start]
+        if calls:
+            st.caption("HTTP calls (cache misses)")
+            st.dataframe(pd.DataFrame([
+                {
+                    "Call": f"{timing.method} {timing.path}",
+                    "Status": timing.status,
+                    "Start ms": round((timing.started - page_start) * 1000, 1),
+                    "ms": round(timing.seconds * 1000, 1),
+                    "Thread": timing.thread,
+                }
+                for timing in calls
+            ]), hide_index=True)
+        else:
+            st.caption("No HTTP calls: every fetch was served from the cache.")
 
-                    # Fetch user details from /api/v1/users/me/
-                    headers = {"Authorization": f"Bearer {token}"}
-                    try:
-                        user_response = requests.get(
-                            f"{API_URL}/api/v1/users/me/",
-                            headers=headers,
-                            timeout=10,
-                        )
-                        if user_response.status_code == 200:
-                            user_data = user_response.json()
-                            st.session_state.user_id = user_data.get("id")
-                            st.session_state.user_email = user_data.get("email") or user_data.get("username")
-                            st.session_state.is_tpo = bool(user_data.get("is_tpo", False))
-                        else:
-                            # Fallback to token response data if /me/ fails
-                            st.session_state.user_email = data.get("email") or data.get("username") or (login_identifier if "@" in login_identifier else None)
-                            st.session_state.user_id = data.get("user_id") or data.get("id")
-                            st.session_state.is_tpo = bool(data.get("is_tpo", False))
-                    except requests.RequestException:
-                        # Fallback to token response data if /me/ fails
-                        st.session_state.user_email = data.get("email") or data.get("username") or (login_identifier if "@" in login_identifier else None)
-                        st.session_state.user_id = data.get("user_id") or data.get("id")
-                        st.session_state.is_tpo = bool(data.get("is_tpo", False))
 
-                    st.success("Login successful!")
+def show_login_page() -> None:
+    st.title("Welcome to AcroConnect")
+    login_tab, register_tab = st.tabs(["Login", "Register (New Student)"])
 
-                    st.rerun()
+    with login_tab:
+        st.subheader("Login")
+        with st.form("login_form", clear_on_submit=False):
+            login_identifier = st.text_input("Username or Email", key="login_identifier")
+            password = st.text_input("Password", type="password", key="login_password")
+            submitted = st.form_submit_button("Log In")
 
-                except requests.RequestException as exc:
+        if submitted:
+            if not login_identifier or not password:
+                st.error("Please enter both username/email and password.")
+            else:
+                try:
+                    # Django token endpoint requires 'username' field
+                    # Send the identifier as username (works for both username and email)
+                    payload = {"username": login_identifier, "password": password}
+                    data = get_client(None).post("/api/token/", data=payload)
+                except ApiError as exc:
+                    st.error(f"Login failed: {exc.message}")
+                    return
 
-                    st.error(f"Login failed: {exc}")
+                token = data.get("access") or data.get("token")
+                if not token:
+                    st.error("Login failed: token missing in response.")
+                    return
 
+                st.session_state.token = token
+                st.session_state.logged_in = True
 
+                # Fetch user details from /api/v1/users/me/
+                try:
+                    user_data = api().get("/api/v1/users/me/")
+                    st.session_state.user_id = user_data.get("id")
+                    st.session_state.user_email = user_data.get("email") or user_data.get("username")
+                    st.session_state.is_tpo = bool(user_data.get("is_tpo", False))
+                except ApiError:
+                    # Fallback to token response data if /me/ fails
+                    st.session_state.user_email = data.get("email") or data.get("username") or (login_identifier if "@" in login_identifier else None)
+                    st.session_state.user_id = data.get("user_id") or data.get("id")
+                    st.session_state.is_tpo = bool(data.get("is_tpo", False))
+
+                st.success("Login successful!")
+                st.rerun()
 
     with register_tab:
-
         st.subheader("Register as a New Student")
-
         with st.form("register_form", clear_on_submit=True):
-
             name = st.text_input("Full Name")
-
             username = st.text_input("Username", key="register_username")
-
             reg_email = st.text_input("Email", key="register_email")
-
             phone = st.text_input("Phone Number")
-
             reg_password = st.text_input("Password", type="password", key="register_password")
-
             register_submit = st.form_submit_button("Create Account")
 
-
-
         if register_submit:
-
             if not all([name, username, reg_email, phone, reg_password]):
-
                 st.error("All fields are required for registration.")
-
             else:
-
                 payload = {
-
                     "name": name,
-
                     "username": username,
-
                     "email": reg_email,
-
                     "phone": phone,
-
                     "password": reg_password,
-
                 }
-
                 try:
-
-                    response = requests.post(
-
-                        f"{API_URL}/api/v1/users/",
-
-                        json=payload,
-
-                        timeout=10,
-
-                    )
-
-                    if response.status_code in (200, 201):
-
-                        try:
-
-                            response_data = response.json()
-
-                            created_username = response_data.get("username", username)
-
-                            created_email = response_data.get("email", reg_email)
-
-                            st.success(f"Registration successful! You can now log in.")
-
-                            st.info(f"Registered with Username: **{created_username}** | Email: **{created_email}**")
-
-                        except ValueError:
-
-                            st.success("Registration successful! You can now log in.")
-
-                    else:
-
-                        try:
-
-                            error_data = response.json()
-
-                            error_message = (
-
-                                error_data.get("detail")
-
-                                or error_data.get("message")
-
-                                or str(error_data)
-
-                            )
-
-                        except ValueError:
-
-                            error_message = response.text or "Unable to register."
-
-                        st.error(f"Registration failed: {error_message}")
-
-                except requests.RequestException as exc:
-
-                    st.error(f"Registration failed: {exc}")
-
-
-
+                    response_data = get_client(None).post("/api/v1/users/", json=payload) or {}
+                except ApiError as exc:
+                    st.error(f"Registration failed: {exc.message}")
+                else:
+                    created_username = response_data.get("username", username)
+                    created_email = response_data.get("email", reg_email)
+                    st.success("Registration successful! You can now log in.")
+                    st.info(f"Registered with Username: **{created_username}** | Email: **{created_email}**")
 
 
 def show_profile_page() -> None:
     """Display and update student profile."""
     token = st.session_state.token
-    user_id = st.session_state.user_id
 
     if not token:
         st.error("Authentication token not found. Please log in again.")
         return
 
-    headers = {"Authorization": f"Bearer {token}"}
-
-    # Fetch current profile data using /me/ endpoint
+    # Profile and skill catalog in one request
     try:
-        response = requests.get(
-            f"{API_URL}/api/v1/student-profiles/me/",
-            headers=headers,
-            timeout=10,
-        )
-        if response.status_code == 200:
-            profile_data = response.json()
-            profile_id = profile_data.get("id")
-        else:
-            st.error(f"Failed to fetch profile: {response.status_code}")
-            profile_data = {}
-            profile_id = None
-    except requests.RequestException as e:
-        st.error(f"Error fetching profile: {e}")
+        home = load_page_data(home=fetch_student_home).get("home")
+        profile_data = home["profile"]
+        profile_id = profile_data.get("id")
+    except ApiError as exc:
+        st.error(f"Failed to fetch profile: {exc.message}")
         profile_data = {}
         profile_id = None
 
@@ -339,55 +408,65 @@ def show_profile_page() -> None:
             "career_goal": career_goal,
         }
         try:
-            update_response = requests.patch(
-                f"{API_URL}/api/v1/student-profiles/{profile_id}/",
-                json=update_payload,
-                headers=headers,
-                timeout=10,
-            )
-            if update_response.status_code in (200, 204):
-                st.success("Profile updated successfully!")
-                st.rerun()
-            else:
-                try:
-                    error_data = update_response.json()
-                    error_message = (
-                        error_data.get("detail")
-                        or error_data.get("message")
-                        or str(error_data)
-                    )
-                except ValueError:
-                    error_message = update_response.text or "Unable to update profile."
-                st.error(f"Update failed: {error_message}")
-        except requests.RequestException as e:
-            st.error(f"Error updating profile: {e}")
-
-    # Display existing skills
+            mutate("PATCH", f"/api/v1/student-profiles/{profile_id}/", [fetch_student_home], json=update_payload)
+        except ApiError as exc:
+            st.error(f"Update failed: {exc.message}")
+        else:
+            st.success("Profile updated successfully!")
+            st.rerun()
+
+    # A full run loads the server's copy; skill edits rerun only the fragment.
+    if "skills_pending" not in st.session_state:
+        st.session_state.skills_items = profile_data.get("skill_assignments", [])
+    show_skills_editor(profile_id, home["skills"])
+
+
+def remove_skill(assignment) -> None:
+    skill_name = assignment.get("skill", {}).get("skill_name", "Unknown")
+    queue_edit(
+        "skills",
+        [a for a in st.session_state.skills_items if a.get("id") != assignment.get("id")],
+        "DELETE", f"/api/v1/student-skill-sets/{assignment.get('id')}/", [fetch_student_home],
+        success=f"Removed {skill_name}", failure=f"Failed to remove {skill_name}",
+    )
+
+
+def add_skill(profile_id, skill_options) -> None:
+    skill = skill_options[st.session_state.add_skill_choice]
+    skill_level = st.session_state.add_skill_level
+    # Shown until the server answers with the new assignment's id.
+    placeholder = {"id": None, "skill": skill, "skill_level": skill_level}
+    queue_edit(
+        "skills",
+        [*st.session_state.skills_items, placeholder],
+        "POST", "/api/v1/student-skill-sets/", [fetch_student_home],
+        json={"student_profile_id": profile_id, "skill_id": skill["id"], "skill_level": skill_level},
+        reconcile=lambda items, created: [created if item is placeholder else item for item in items],
+        success="Skill added successfully!", failure="Failed to add skill",
+    )
+
+
+@st.fragment
+def show_skills_editor(profile_id, all_skills) -> None:
+    """The student's skills with Remove buttons and the Add New Skill form."""
     st.write("### Your Skills")
-    skill_assignments = profile_data.get("skill_assignments", [])
+    show_edit_notice("skills")
+
+    skill_assignments = st.session_state.skills_items
     if skill_assignments:
         for assignment in skill_assignments:
             skill = assignment.get("skill", {})
             skill_name = skill.get("skill_name", "Unknown")
             skill_level = assignment.get("skill_level", 0)
+            saved = assignment.get("id") is not None
             col1, col2 = st.columns([3, 1])
             with col1:
-                st.write(f"**{skill_name}**")
+                st.write(f"**{skill_name}**" if saved else f"**{skill_name}** (saving...)")
             with col2:
-                if st.button("Remove", key=f"remove_skill_{assignment.get('id')}"):
-                    try:
-                        delete_response = requests.delete(
-                            f"{API_URL}/api/v1/student-skill-sets/{assignment.get('id')}/",
-                            headers=headers,
-                            timeout=10,
-                        )
-                        if delete_response.status_code in (200, 204):
-                            st.success(f"Removed {skill_name}")
-                            st.rerun()
-                        else:
-                            st.error("Failed to remove skill.")
-                    except requests.RequestException as e:
-                        st.error(f"Error removing skill: {e}")
+                st.button(
+                    "Remove", key=f"remove_skill_{assignment['id'] if saved else 'new_' + str(skill.get('id'))}",
+                    disabled=not saved, on_click=remove_skill, args=(assignment,),
+                )
             st.progress(skill_level / 5.0 if skill_level <= 5 else 1.0)
             st.caption(f"Level: {skill_level}/5")
     else:
@@ -395,91 +474,34 @@ def show_profile_page() -> None:
 
     # Add Skill Form
     st.write("### Add New Skill")
-    try:
-        skills_response = requests.get(
-            f"{API_URL}/api/v1/skills/",
-            headers=headers,
-            timeout=10,
-        )
-        if skills_response.status_code == 200:
-            all_skills = skills_response.json()
-            existing_skill_ids = [a.get("skill", {}).get("id") for a in skill_assignments if a.get("skill")]
-            available_skills = [s for s in all_skills if s.get("id") not in existing_skill_ids]
-            
-            if available_skills:
-                with st.form("add_skill_form", clear_on_submit=True):
-                    skill_options = {f"{s.get('skill_name')} ({s.get('category', 'N/A')})": s.get("id") for s in available_skills}
-                    selected_skill = st.selectbox("Select Skill", options=list(skill_options.keys()))
-                    skill_level = st.slider("Skill Level", min_value=1, max_value=5, value=3, step=1)
-                    add_skill_button = st.form_submit_button("Add Skill")
-
-                if add_skill_button:
-                    selected_skill_id = skill_options[selected_skill]
-                    skill_payload = {
-                        "student_profile_id": profile_id,
-                        "skill_id": selected_skill_id,
-                        "skill_level": skill_level,
-                    }
-                    try:
-                        add_response = requests.post(
-                            f"{API_URL}/api/v1/student-skill-sets/",
-                            json=skill_payload,
-                            headers=headers,
-                            timeout=10,
-                        )
-                        if add_response.status_code in (200, 201):
-                            st.success("Skill added successfully!")
-                            st.rerun()
-                        else:
-                            try:
-                                error_data = add_response.json()
-                                error_message = (
-                                    error_data.get("detail")
-                                    or error_data.get("message")
-                                    or str(error_data)
-                                )
-                            except ValueError:
-                                error_message = add_response.text or "Unable to add skill."
-                            st.error(f"Failed to add skill: {error_message}")
-                    except requests.RequestException as e:
-                        st.error(f"Error adding skill: {e}")
-            else:
-                st.info("All available skills have been added to your profile.")
-        else:
-            st.error(f"Failed to fetch skills: {skills_response.status_code}")
-    except requests.RequestException as e:
-        st.error(f"Error fetching skills: {e}")
+    existing_skill_ids = [a.get("skill", {}).get("id") for a in skill_assignments if a.get("skill")]
+    available_skills = [s for s in all_skills if s.get("id") not in existing_skill_ids]
+
+    if not available_skills:
+        st.info("All available skills have been added to your profile.")
+    else:
+        with st.form("add_skill_form", clear_on_submit=True):
+            skill_options = {f"{s.get('skill_name')} ({s.get('category', 'N/A')})": s for s in available_skills}
+            st.selectbox("Select Skill", options=list(skill_options.keys()), key="add_skill_choice")
+            st.slider("Skill Level", min_value=1, max_value=5, value=3, step=1, key="add_skill_level")
+            st.form_submit_button("Add Skill", on_click=add_skill, args=(profile_id, skill_options))
+
+    send_queued_edit("skills")
+
 
 def show_roadmap_page() -> None:
     """Display and generate AI roadmaps for the student."""
     token = st.session_state.token
-    user_id = st.session_state.user_id
 
     if not token:
         st.error("Authentication token not found. Please log in again.")
         return
 
-    headers = {"Authorization": f"Bearer {token}"}
-
-    # Fetch all roadmaps
+    # The student's own roadmaps
     try:
-        response = requests.get(
-            f"{API_URL}/api/v1/roadmaps/",
-            headers=headers,
-            timeout=10,
-        )
-        if response.status_code == 200:
-            all_roadmaps = response.json()
-            # Filter roadmaps for current user
-            user_roadmaps = [
-                r for r in all_roadmaps
-                if r.get("profile", {}).get("user", {}).get("id") == user_id
-            ]
-        else:
-            st.error(f"Failed to fetch roadmaps: {response.status_code}")
-            user_roadmaps = []
-    except requests.RequestException as e:
-        st.error(f"Error fetching roadmaps: {e}")
+        user_roadmaps = load_page_data(home=fetch_student_home).get("home")["roadmaps"]
+    except ApiError as exc:
+        st.error(f"Failed to fetch roadmaps: {exc.message}")
         user_roadmaps = []
 
     st.subheader("AI Roadmap")
@@ -498,141 +520,217 @@ def show_roadmap_page() -> None:
     # Generate new roadmap button
     st.write("### Generate New Roadmap")
     st.write("**Note:** Your AI roadmap will be generated based on your current profile, skills, and career goal. Make sure to update your profile first!")
-    
+
     if st.button("🚀 Generate New AI Roadmap", use_container_width=True):
         with st.spinner("✨ Generating your personalized AI roadmap using Google Gemini..."):
             try:
-                generate_response = requests.post(
-                    f"{API_URL}/api/v1/generate-roadmap/",
-                    headers=headers,
-                    timeout=60,
-                )
-                if generate_response.status_code == 201:
-                    new_roadmap = generate_response.json()
-                    st.success("✅ Roadmap generated successfully!")
-                    st.rerun()
-                else:
-                    try:
-                        error_data = generate_response.json()
-                        error_message = (
-                            error_data.get("detail")
-                            or error_data.get("message")
-                            or str(error_data)
-                        )
-                    except ValueError:
-                        error_message = generate_response.text or "Unable to generate roadmap."
-                    st.error(f"❌ Failed to generate roadmap: {error_message}")
-            except requests.RequestException as e:
-                st.error(f"❌ Error generating roadmap: {e}")
+                mutate("POST", "/api/v1/generate-roadmap/", [fetch_student_home], timeout=60)
+            except ApiError as exc:
+                st.error(f"❌ Failed to generate roadmap: {exc.message}")
+            else:
+                st.success("✅ Roadmap generated successfully!")
+                st.rerun()
+
+
+def toggle_job_details(job_id) -> None:
+    open_job = st.session_state.get("open_job_id")
+    st.session_state.open_job_id = None if open_job == job_id else job_id
+
+
+def current_page(key, filters) -> int:
+    """The page number kept under ``key``, back to 1 whenever ``filters`` change."""
+    if st.session_state.get(f"{key}_filters") != filters:
+        st.session_state[f"{key}_filters"] = filters
+        st.session_state[f"{key}_page"] = 1
+    return st.session_state[f"{key}_page"]
+
+
+def change_page(key, step) -> None:
+    st.session_state[f"{key}_page"] += step
+
+
+def show_pager(key, page, result, page_size, noun) -> None:
+    """Previous/Next buttons and a page caption for a paginated ``result``."""
+    page_count = max(1, -(-result["count"] // page_size))
+    prev_col, info_col, next_col = st.columns([1, 3, 1])
+    with prev_col:
+        st.button(
+            "Previous", key=f"{key}_prev", disabled=not result["previous"],
+            on_click=change_page, args=(key, -1),
+        )
+    with info_col:
+        st.caption(f"Page {page} of {page_count} - {result['count']} {noun}")
+    with next_col:
+        st.button(
+            "Next", key=f"{key}_next", disabled=not result["next"],
+            on_click=change_page, args=(key, 1),
+        )
+
+
+def show_job_details(token, job_id) -> None:
+    """Full description, skills and poster of one posting, fetched on open."""
+    try:
+        job = fetch_job_posting(token, job_id)
+    except ApiError as exc:
+        st.error(f"Failed to fetch job posting: {exc.message}")
+        return
+
+    company = job.get("company", "")
+    required_skills = job.get("required_skills", [])
+    tpo_user = job.get("tpo_user", {})
+
+    with st.container(border=True):
+        if company:
+            st.write(f"**Company:** {company}")
+        st.write("**Description:**")
+        st.write(job.get("description", "No description available."))
+
+        if required_skills:
+            st.write("**Required Skills:**")
+            skill_names = [
+                skill.get("skill", {}).get("skill_name", "Unknown")
+                for skill in required_skills
+                if skill.get("skill")
+            ]
+            st.write(", ".join(skill_names) if skill_names else "None specified")
+
+        if tpo_user:
+            tpo_name = tpo_user.get("first_name") or tpo_user.get("username", "Unknown")
+            st.write(f"**Posted by:** {tpo_name}")
 
 
 def show_job_board_page() -> None:
-    """Display all available job postings."""
+    """
+    Page through job postings as compact rows. Search and company filters
+    run on the backend, and a posting's details load when it is opened.
+    """
     token = st.session_state.token
 
     if not token:
         st.error("Authentication token not found. Please log in again.")
         return
 
-    headers = {"Authorization": f"Bearer {token}"}
-
     st.subheader("Job Board")
 
+    # Widget values from the previous run, so the page can be fetched
+    # together with the company list before the widgets are drawn.
+    search = st.session_state.get("job_search", "").strip()
+    company = st.session_state.get("job_company", ALL_COMPANIES)
+    page = current_page("job_board", (search, company))
+
+    page_data = load_page_data(
+        companies=fetch_companies,
+        board=lambda token: fetch_job_board_page(
+            token, page, search, None if company == ALL_COMPANIES else company
+        ),
+    )
     try:
-        response = requests.get(
-            f"{API_URL}/api/v1/job-postings/",
-            headers=headers,
-            timeout=10,
-        )
-        if response.status_code == 200:
-            jobs = response.json()
-            if jobs:
-                for job in jobs:
-                    job_id = job.get("id")
-                    title = job.get("title", "Untitled")
-                    company = job.get("company", "")
-                    description = job.get("description", "No description available.")
-                    posted_on = job.get("posted_on", "")
-                    required_skills = job.get("required_skills", [])
-                    tpo_user = job.get("tpo_user", {})
-
-                    expander_title = f"**{title}**"
-                    if company:
-                        expander_title += f" - {company}"
-                    expander_title += f" - Posted on {posted_on[:10] if posted_on else 'Unknown date'}"
-
-                    with st.expander(expander_title):
-                        if company:
-                            st.write(f"**Company:** {company}")
-                        st.write("**Description:**")
-                        st.write(description)
-                        
-                        if required_skills:
-                            st.write("**Required Skills:**")
-                            skill_names = [
-                                skill.get("skill", {}).get("skill_name", "Unknown")
-                                for skill in required_skills
-                                if skill.get("skill")
-                            ]
-                            st.write(", ".join(skill_names) if skill_names else "None specified")
-                        
-                        if tpo_user:
-                            tpo_name = tpo_user.get("first_name") or tpo_user.get("username", "Unknown")
-                            st.write(f"**Posted by:** {tpo_name}")
-            else:
-                st.info("No job postings available at the moment. Check back later!")
+        companies = page_data.get("companies")
+    except ApiError:
+        companies = []
+    if company != ALL_COMPANIES and company not in companies:
+        company = st.session_state.job_company = ALL_COMPANIES
+
+    search_col, company_col = st.columns([2, 1])
+    with search_col:
+        st.text_input("Search", key="job_search", placeholder="Title, company or description")
+    with company_col:
+        st.selectbox("Company", [ALL_COMPANIES, *companies], key="job_company")
+
+    try:
+        board = page_data.get("board")
+    except ApiError as exc:
+        st.error(f"Failed to fetch job postings: {exc.message}")
+        return
+
+    jobs = board["results"]
+    if not jobs:
+        if search or company != ALL_COMPANIES:
+            st.info("No job postings match these filters.")
         else:
-            st.error(f"Failed to fetch job postings: {response.status_code}")
-    except requests.RequestException as e:
-        st.error(f"Error fetching job postings: {e}")
+            st.info("No job postings available at the moment. Check back later!")
+        return
+
+    for job in jobs:
+        job_id = job.get("id")
+        title = job.get("title", "Untitled")
+        company_name = job.get("company", "")
+        posted_on = job.get("posted_on", "")
+        is_open = st.session_state.get("open_job_id") == job_id
+
+        row_title = f"**{title}**"
+        if company_name:
+            row_title += f" - {company_name}"
+        row_title += f" - Posted on {posted_on[:10] if posted_on else 'Unknown date'}"
+
+        text_col, button_col = st.columns([5, 1])
+        with text_col:
+            st.markdown(row_title)
+        with button_col:
+            st.button(
+                "Hide" if is_open else "Details",
+                key=f"job_details_{job_id}",
+                on_click=toggle_job_details,
+                args=(job_id,),
+            )
+        if is_open:
+            show_job_details(token, job_id)
+
+    show_pager("job_board", page, board, JOB_BOARD_PAGE_SIZE, "postings")
+
+
+def student_table_query() -> tuple:
+    """Params of the student table page picked by the dashboard's widgets."""
+    name = st.session_state.get("student_name", "").strip()
+    skill_id = st.session_state.get("student_skill")
+    cgpa_min, cgpa_max = st.session_state.get("student_cgpa", (0.0, 10.0))
+    sort = st.session_state.get("student_sort", next(iter(STUDENT_TABLE_SORTS)))
+
+    filters = [("ordering", STUDENT_TABLE_SORTS[sort])]
+    if name:
+        filters.append(("name", name))
+    if skill_id is not None:
+        filters.append(("skill", skill_id))
+    if cgpa_min > 0:
+        filters.append(("cgpa_min", cgpa_min))
+    if cgpa_max < 10:
+        filters.append(("cgpa_max", cgpa_max))
+
+    page = current_page("student_table", tuple(filters))
+    return (*filters, ("page", page), ("page_size", STUDENT_TABLE_PAGE_SIZE))
 
 
 def show_tpo_dashboard_page() -> None:
-    """TPO Dashboard with analytics and student management."""
+    """
+    TPO Dashboard with analytics and student management. The student table
+    is sorted, filtered and paged by the backend, one page per request.
+    """
     token = st.session_state.token
 
     if not token:
         st.error("Authentication token not found. Please log in again.")
         return
 
-    headers = {"Authorization": f"Bearer {token}"}
-
     st.subheader("TPO Dashboard")
 
-    # Fetch all student profiles
+    # Widget values from the previous run, so the table page is fetched
+    # together with the dashboard before the widgets are drawn.
+    query = student_table_query()
+    page_data = load_page_data(
+        dashboard=fetch_tpo_dashboard,
+        table=lambda token: fetch_student_table_page(token, query),
+    )
     try:
-        response = requests.get(
-            f"{API_URL}/api/v1/student-profiles/",
-            headers=headers,
-            timeout=10,
-        )
-        if response.status_code == 200:
-            profiles = response.json()
-        else:
-            st.error(f"Failed to fetch student profiles: {response.status_code}")
-            profiles = []
-    except requests.RequestException as e:
-        st.error(f"Error fetching student profiles: {e}")
-        profiles = []
-
-    if not profiles:
-        st.info("No student profiles found.")
+        dashboard = page_data.get("dashboard")
+    except ApiError as exc:
+        st.error(f"Failed to fetch the dashboard: {exc.message}")
         return
 
-    # Prepare data for analytics
-    all_skills = []
-    skill_counts = {}
-    total_skills = 0
+    skills = {skill["id"]: skill["skill_name"] for skill in dashboard["skills"]}
 
-    for profile in profiles:
-        skill_assignments = profile.get("skill_assignments", [])
-        for assignment in skill_assignments:
-            skill = assignment.get("skill", {})
-            skill_name = skill.get("skill_name", "")
-            if skill_name:
-                all_skills.append(skill_name)
-                skill_counts[skill_name] = skill_counts.get(skill_name, 0) + 1
-                total_skills += 1
+    if not dashboard["total_students"]:
+        st.info("No student profiles found.")
+        return
 
     # Analytics Charts
     st.write("### Analytics")
@@ -641,87 +739,84 @@ def show_tpo_dashboard_page() -> None:
 
     with col1:
         st.write("**Skill Distribution**")
-        if skill_counts:
+        if dashboard["skill_distribution"]:
             skill_df = pd.DataFrame(
-                list(skill_counts.items()),
+                [(row["skill_name"], row["count"]) for row in dashboard["skill_distribution"]],
                 columns=["Skill", "Count"]
-            ).sort_values("Count", ascending=False)
+            )
             st.bar_chart(skill_df.set_index("Skill"))
         else:
             st.info("No skills data available.")
 
     with col2:
         st.write("**Average Skills per Student**")
-        if profiles:
-            avg_skills = total_skills / len(profiles) if len(profiles) > 0 else 0
-            st.metric("Average Skills", f"{avg_skills:.2f}")
-            st.metric("Total Students", len(profiles))
-        else:
-            st.info("No student data available.")
+        st.metric("Average Skills", f"{dashboard['average_skills']:.2f}")
+        st.metric("Total Students", dashboard["total_students"])
 
     # Student Data Table
     st.write("### All Students")
-    
-    # Prepare DataFrame
-    student_data = []
-    for profile in profiles:
-        user = profile.get("user", {})
-        skill_assignments = profile.get("skill_assignments", [])
-        skills_list = [
-            assignment.get("skill", {}).get("skill_name", "")
-            for assignment in skill_assignments
-            if assignment.get("skill")
-        ]
-        
-        student_data.append({
-            "ID": profile.get("id"),
-            "User ID": user.get("id"),
-            "Full Name": profile.get("full_name", ""),
-            "Email": user.get("email", ""),
-            "Phone": profile.get("phone", ""),
-            "CGPA": profile.get("cgpa", 0.0),
-            "Skills": ", ".join(skills_list) if skills_list else "None",
-            "Skill Count": len(skills_list),
-        })
-
-    if student_data:
-        df = pd.DataFrame(student_data)
-        st.dataframe(df, use_container_width=True)
-
-        # Delete Student Function
-        st.write("### Delete Student")
-        with st.form("delete_student_form", clear_on_submit=True):
-            user_id_to_delete = st.number_input(
-                "Enter User ID to delete",
-                min_value=1,
-                step=1,
-                key="delete_user_id"
-            )
-            delete_submit = st.form_submit_button("Delete Student", type="primary")
 
-            if delete_submit:
-                try:
-                    delete_response = requests.delete(
-                        f"{API_URL}/api/v1/student-profiles/{user_id_to_delete}/",
-                        headers=headers,
-                        timeout=10,
-                    )
-                    if delete_response.status_code in (200, 204):
-                        st.success(f"Student with User ID {user_id_to_delete} deleted successfully!")
-                        st.rerun()
-                    else:
-                        try:
-                            error_data = delete_response.json()
-                            error_message = (
-                                error_data.get("detail")
-                                or error_data.get("message")
-                                or str(error_data)
-                            )
-                        except ValueError:
-                            error_message = delete_response.text or "Unable to delete student."
-                        st.error(f"Delete failed: {error_message}")
-                except requests.RequestException as e:
-                    st.error(f"Error deleting student: {e}")
+    name_col, skill_col = st.columns(2)
+    with name_col:
+        st.text_input("Name starts with", key="student_name")
+    with skill_col:
+        st.selectbox(
+            "Skill", [None, *skills], key="student_skill",
+            format_func=lambda skill_id: "Any skill" if skill_id is None else skills[skill_id],
+        )
+    cgpa_col, sort_col = st.columns(2)
+    with cgpa_col:
+        st.slider("CGPA", 0.0, 10.0, (0.0, 10.0), step=0.1, key="student_cgpa")
+    with sort_col:
+        st.selectbox("Sort by", list(STUDENT_TABLE_SORTS), key="student_sort")
+
+    try:
+        table = page_data.get("table")
+    except ApiError as exc:
+        st.error(f"Failed to fetch student profiles: {exc.message}")
+        return
+
+    if table["results"]:
+        df = pd.DataFrame([
+            {
+                "ID": row["id"],
+                "User ID": row["user_id"],
+                "Full Name": row["full_name"],
+                "Email": row["email"],
+                "Phone": row["phone"],
+                "CGPA": row["cgpa"],
+                "Skills": ", ".join(row["skills"]) or "None",
+                "Skill Count": row["skill_count"],
+            }
+            for row in table["results"]
+        ])
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No students match these filters.")
+    show_pager("student_table", dict(query)["page"], table, STUDENT_TABLE_PAGE_SIZE, "students")
+
+    # Delete Student Function
+    st.write("### Delete Student")
+    with st.form("delete_student_form", clear_on_submit=True):
+        user_id_to_delete = st.number_input(
+            "Enter User ID to delete",
+            min_value=1,
+            step=1,
+            key="delete_user_id"
+        )
+        delete_submit = st.form_submit_button("Delete Student", type="primary")
+
+        if delete_submit:
+            try:
+                mutate(
+                    "DELETE", f"/api/v1/student-profiles/{user_id_to_delete}/",
+                    [fetch_tpo_dashboard, fetch_student_table_page],
+                )
+            except ApiError as exc:
+                st.error(f"Delete failed: {exc.message}")
+            else:
+                st.success(f"Student with User ID {user_id_to_delete} deleted successfully!")
+                st.rerun()
 
 
 def show_job_management_page() -> None:
@@ -732,8 +827,6 @@ def show_job_management_page() -> None:
         st.error("Authentication token not found. Please log in again.")
         return
 
-    headers = {"Authorization": f"Bearer {token}"}
-
     st.subheader("Job Management")
 
     # Form to post new job
@@ -754,96 +847,91 @@ def show_job_management_page() -> None:
                     "description": job_description,
                 }
                 try:
-                    response = requests.post(
-                        f"{API_URL}/api/v1/job-postings/",
-                        json=payload,
-                        headers=headers,
-                        timeout=10,
-                    )
-                    if response.status_code in (200, 201):
-                        st.success("Job posted successfully!")
-                        st.rerun()
-                    else:
-                        try:
-                            error_data = response.json()
-                            error_message = (
-                                error_data.get("detail")
-                                or error_data.get("message")
-                                or str(error_data)
-                            )
-                        except ValueError:
-                            error_message = response.text or "Unable to post job."
-                        st.error(f"Failed to post job: {error_message}")
-                except requests.RequestException as e:
-                    st.error(f"Error posting job: {e}")
-
-    # Display existing jobs
+                    mutate("POST", "/api/v1/job-postings/", [fetch_companies, fetch_job_board_page, fetch_job_posting, fetch_posted_jobs_page], json=payload)
+                except ApiError as exc:
+                    st.error(f"Failed to post job: {exc.message}")
+                else:
+                    st.success("Job posted successfully!")
+                    st.rerun()
+
+    # Display existing jobs: one page of the current TPO's postings
     st.write("### Existing Job Postings")
+    user_id = st.session_state.user_id
+    page = current_page("posted_jobs", (user_id,))
     try:
-        response = requests.get(
-            f"{API_URL}/api/v1/job-postings/",
-            headers=headers,
-            timeout=10,
-        )
-        if response.status_code == 200:
-            jobs = response.json()
-            if jobs:
-                # Filter jobs posted by current TPO user
-                tpo_jobs = [job for job in jobs if job.get("tpo_user", {}).get("id") == st.session_state.user_id]
-                
-                if tpo_jobs:
-                    for job in tpo_jobs:
-                        job_id = job.get("id")
-                        title = job.get("title", "Untitled")
-                        company = job.get("company", "")
-                        description = job.get("description", "No description available.")
-                        posted_on = job.get("posted_on", "")
-                        required_skills = job.get("required_skills", [])
-
-                        expander_title = f"**{title}**"
-                        if company:
-                            expander_title += f" - {company}"
-                        expander_title += f" - Posted on {posted_on[:10] if posted_on else 'Unknown date'}"
-
-                        with st.expander(expander_title):
-                            if company:
-                                st.write(f"**Company:** {company}")
-                            st.write("**Description:**")
-                            st.write(description)
-                            
-                            if required_skills:
-                                st.write("**Required Skills:**")
-                                skill_names = [
-                                    skill.get("skill", {}).get("skill_name", "Unknown")
-                                    for skill in required_skills
-                                    if skill.get("skill")
-                                ]
-                                st.write(", ".join(skill_names) if skill_names else "None specified")
-                            
-                            # Delete button for each job
-                            if st.button(f"Delete Job", key=f"delete_job_{job_id}"):
-                                try:
-                                    delete_response = requests.delete(
-                                        f"{API_URL}/api/v1/job-postings/{job_id}/",
-                                        headers=headers,
-                                        timeout=10,
-                                    )
-                                    if delete_response.status_code in (200, 204):
-                                        st.success(f"Job '{title}' deleted successfully!")
-                                        st.rerun()
-                                    else:
-                                        st.error("Failed to delete job.")
-                                except requests.RequestException as e:
-                                    st.error(f"Error deleting job: {e}")
-                else:
-                    st.info("You haven't posted any jobs yet.")
-            else:
-                st.info("No job postings available.")
-        else:
-            st.error(f"Failed to fetch job postings: {response.status_code}")
-    except requests.RequestException as e:
-        st.error(f"Error fetching job postings: {e}")
+        jobs = load_page_data(
+            jobs=lambda token: fetch_posted_jobs_page(token, user_id, page)
+        ).get("jobs")
+    except ApiError as exc:
+        if exc.status == 404 and page > 1:
+            # Deletions emptied the last page.
+            change_page("posted_jobs", -1)
+            st.rerun()
+        st.error(f"Failed to fetch job postings: {exc.message}")
+        return
+
+    # A full run loads the server's copy, deletions rerun only the fragment.
+    if "posted_jobs_pending" not in st.session_state:
+        st.session_state.posted_jobs_items = jobs["results"]
+    show_posted_jobs()
+    show_pager("posted_jobs", page, jobs, JOB_BOARD_PAGE_SIZE, "postings")
+
+
+def delete_job(job) -> None:
+    title = job.get("title", "Untitled")
+    queue_edit(
+        "posted_jobs",
+        [j for j in st.session_state.posted_jobs_items if j.get("id") != job.get("id")],
+        "DELETE", f"/api/v1/job-postings/{job.get('id')}/",
+        [fetch_companies, fetch_job_board_page, fetch_job_posting, fetch_posted_jobs_page],
+        success=f"Job '{title}' deleted successfully!", failure=f"Failed to delete job '{title}'",
+    )
+
 
+@st.fragment
+def show_posted_jobs() -> None:
+    """The current TPO's postings, each deletable without a full rerun."""
+    show_edit_notice("posted_jobs")
+
+    tpo_jobs = st.session_state.posted_jobs_items
+    if not tpo_jobs:
+        if st.session_state.posted_jobs_page > 1:
+            st.info("No more postings on this page.")
+        else:
+            st.info("You haven't posted any jobs yet.")
+
+    for job in tpo_jobs:
+        job_id = job.get("id")
+        title = job.get("title", "Untitled")
+        company = job.get("company", "")
+        description = job.get("description", "No description available.")
+        posted_on = job.get("posted_on", "")
+        required_skills = job.get("required_skills", [])
+
+        expander_title = f"**{title}**"
+        if company:
+            expander_title += f" - {company}"
+        expander_title += f" - Posted on {posted_on[:10] if posted_on else 'Unknown date'}"
+
+        with st.expander(expander_title):
+            if company:
+                st.write(f"**Company:** {company}")
+            st.write("**Description:**")
+            st.write(description)
+
+            if required_skills:
+                st.write("**Required Skills:**")
+                skill_names = [
+                    skill.get("skill", {}).get("skill_name", "Unknown")
+                    for skill in required_skills
+                    if skill.get("skill")
+                ]
+                st.write(", ".join(skill_names) if skill_names else "None specified")
+
+            # Delete button for each job
+            st.button("Delete Job", key=f"delete_job_{job_id}", on_click=delete_job, args=(job,))
+
+    send_queued_edit("posted_jobs")
 
 
 def show_main_app() -> None:
@@ -852,6 +940,8 @@ def show_main_app() -> None:
 
     if st.sidebar.button("Logout"):
 
+        forget_cached_data()
+
         reset_session_state()
 
         st.rerun()
@@ -880,6 +970,9 @@ def show_main_app() -> None:
 
 
 
+    page_start = time.perf_counter()
+    st.session_state.page_data_timings = []
+
     # Route to appropriate page based on selection
     if st.session_state.is_tpo:
         if selected_option == "TPO Dashboard":
@@ -894,6 +987,9 @@ def show_main_app() -> None:
         elif selected_option == "Job Board":
             show_job_board_page()
 
+    if debug_enabled():
+        show_debug_panel(page_start)
+
 
 
 